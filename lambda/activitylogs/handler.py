@@ -2,9 +2,11 @@ import json
 from EventCoord.utils.types import APIGatewayProxyEvent
 from aws_lambda_typing.context import Context as LambdaContext
 from EventCoord.utils.types import APIGatewayProxyResponse
-from EventCoord.launchdarkly.flags import Flags
+from EventCoord.launchdarkly.flags import get_flags
 from EventCoord.models.activitylogs import ActivityLog
+from EventCoord.utils.pagination import get_page_params, page_headers
 from EventCoord.utils.response import build_response
+from EventCoord.utils.update_expression import VersionConflictError
 from EventCoord.utils.handler import CORS_HEADERS, get_claims, get_logger, init_tracing
 
 init_tracing()
@@ -18,7 +20,7 @@ def lambda_handler(
     logger.debug(f"Authorizer event: {event}")
     logger.debug(f"Authorizer context: {context}")
     claims = get_claims(event)
-    flags = Flags(claims)
+    flags = get_flags(event, claims)
     org_id = claims.get('org_id')
     if not org_id:
         return build_response(
@@ -50,8 +52,19 @@ def lambda_handler(
             items = ActivityLog.list_by_period(org_id, period_id)
             return build_response(200, items, headers=CORS_HEADERS)
         else:
-            items = ActivityLog.list(org_id)
-            return build_response(200, items, headers=CORS_HEADERS)
+            try:
+                limit, start_key = get_page_params(event, org_id)
+            except ValueError as e:
+                return build_response(400, {'error': str(e)}, headers=CORS_HEADERS)
+            if limit is None:
+                items = ActivityLog.list(org_id)
+                return build_response(200, items, headers=CORS_HEADERS)
+            items, last_key = ActivityLog.list_page(org_id, limit, start_key)
+            return build_response(
+                200,
+                items,
+                headers=page_headers(CORS_HEADERS, last_key)
+            )
 
     elif method == 'POST':
         import uuid
@@ -85,6 +98,7 @@ def lambda_handler(
             )
         from datetime import datetime, timezone
         body = json.loads(event.get('body') or '{}')
+        expected_version = body.pop('version', None)
         body['logId'] = log_id
         if 'periodId' not in body or not body['periodId']:
             return build_response(
@@ -96,10 +110,17 @@ def lambda_handler(
             body['timestamp'] = datetime.now(
                 timezone.utc).isoformat().replace('+00:00', 'Z')
         body['org_id'] = org_id
-        ActivityLog.update(org_id, log_id, body)
+        try:
+            item = ActivityLog.update(org_id, log_id, body, expected_version)
+        except VersionConflictError:
+            return build_response(
+                409,
+                {'error': 'Activity log was modified by another request'},
+                headers=CORS_HEADERS
+            )
         return build_response(
             200,
-            {'message': 'Activity log updated', 'id': log_id},
+            {'message': 'Activity log updated', 'id': log_id, 'version': item.get('version')},
             headers=CORS_HEADERS
         )
 
@@ -1,48 +1,50 @@
+import hashlib
 import os
 import time
-import requests
-import threading
 from authlib.jose import JsonWebToken, JWTClaims
 from typing import Optional, Literal, Any
 from aws_lambda_typing.events import APIGatewayRequestAuthorizerEvent
 from aws_lambda_typing.context import Context as LambdaContext
 from aws_lambda_typing.responses.api_gateway_authorizer import APIGatewayAuthorizerResponse
 from aws_lambda_typing.common import PolicyDocument
+from EventCoord.client.jwks import get_jwks_cache
+from EventCoord.launchdarkly.flags import Flags
+from EventCoord.utils.cache import TTLCache
 from EventCoord.utils.handler import get_logger, init_tracing
 
 init_tracing()
 logger = get_logger(__name__)
 
-_JWKS_CACHE = []
-_JWKS_CACHE_LOCK = threading.Lock()
-_JWKS_CACHE_EXPIRY = 300  # seconds
-_JWKS_CACHE_LAST_FETCH = 0
+TOKEN_LEEWAY = 3  # seconds
+# Verified claims keyed by token hash, each kept until its exp minus leeway
+_VERIFIED_TOKENS: TTLCache[JWTClaims] = TTLCache(
+    maxsize=int(os.environ.get("TOKEN_CACHE_SIZE", "1024")), ttl=0)
+TOKEN_CACHE_STATS = {"hits": 0, "misses": 0}
 
 
-def get_jwks(jwks_url: str):
-    global _JWKS_CACHE, _JWKS_CACHE_LAST_FETCH
-    now = time.time()
-    with _JWKS_CACHE_LOCK:
-        if not _JWKS_CACHE or (now - _JWKS_CACHE_LAST_FETCH) > _JWKS_CACHE_EXPIRY:
-            resp = requests.get(jwks_url, timeout=5)
-            resp.raise_for_status()
-            _JWKS_CACHE = resp.json()['keys']
-            _JWKS_CACHE_LAST_FETCH = now
-    return _JWKS_CACHE
+def _token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
 
 
 def verify_jwt_token(token: str) -> Optional[JWTClaims]:
     JWT_ISSUER = os.environ.get('JWT_ISSUER', 'https://your-api-domain')
+    cache_key = _token_cache_key(token)
+    cached = _VERIFIED_TOKENS.get(cache_key)
+    if cached is not None:
+        TOKEN_CACHE_STATS["hits"] += 1
+        logger.info(f"Token cache hit: {TOKEN_CACHE_STATS}")
+        return cached
+    TOKEN_CACHE_STATS["misses"] += 1
+    logger.info(f"Token cache miss: {TOKEN_CACHE_STATS}")
     try:
         logger.info(
             f"Verifying JWT token: {token[:10]}... (truncated)")
-        jwks = get_jwks(f"{JWT_ISSUER}/.well-known/jwks.json")
-        logger.debug(f"JWKS keys: {jwks}")
+        jwks = get_jwks_cache(f"{JWT_ISSUER}/.well-known/jwks.json")
         jwt_obj = JsonWebToken(['RS256'])
         logger.debug("About to decode JWT")
         claims = jwt_obj.decode(
             token,
-            jwks,
+            jwks.load_key,
             claims_options={
                 "iss": {
                     "essential": True,
@@ -51,14 +53,44 @@ def verify_jwt_token(token: str) -> Optional[JWTClaims]:
             }
         )
         logger.debug("Decoded JWT, about to validate")
-        claims.validate(now=int(time.time()), leeway=3)
+        now = int(time.time())
+        claims.validate(now=now, leeway=TOKEN_LEEWAY)
         logger.debug(f"Decoded JWT payload: {claims}")
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)) and exp - TOKEN_LEEWAY > now:
+            _VERIFIED_TOKENS.set(cache_key, claims, ttl=exp - TOKEN_LEEWAY - now)
         return claims
     except Exception as e:
         logger.warning(f"JWT verification error: {e}", exc_info=True)
         return None
 
 
+def _get_entitlements(claims: JWTClaims) -> dict:
+    try:
+        return Flags(claims).entitlements()
+    except Exception as e:
+        logger.warning(f"Could not evaluate entitlements; handlers will evaluate flags themselves: {e}")
+        return {}
+
+
+def get_policy_resource(method_arn: str, scope: Optional[str] = None) -> str:
+    """
+    Resource the policy applies to. With scope "stage" the policy covers every
+    method and path of the requested API stage, so a decision cached by API
+    Gateway (keyed on the token alone) stays valid for all of the token's
+    calls. Anything else grants only the requested method ARN.
+    """
+    scope = scope or os.environ.get("AUTHORIZER_POLICY_SCOPE", "method")
+    if scope != "stage":
+        return method_arn
+    # arn:aws:execute-api:{region}:{account}:{apiId}/{stage}/{method}/{path}
+    api_arn, _, path = method_arn.partition("/")
+    stage = path.split("/", 1)[0]
+    if not stage:
+        return method_arn
+    return f"{api_arn}/{stage}/*"
+
+
 def get_policy_document(
     effect: Literal["Allow", "Deny"],
     method_arn: str
@@ -68,7 +100,7 @@ def get_policy_document(
         "Statement": [{
             "Action": "execute-api:Invoke",
             "Effect": effect,
-            "Resource": method_arn
+            "Resource": get_policy_resource(method_arn)
         }]
     }
 
@@ -113,16 +145,21 @@ def lambda_handler(
             logger.error("JWT verification failed: claims is None")
             return build_response("unauthorized", get_policy_document('Deny', method_arn))
         logger.info(f"Authenticated claims: {claims}")
+        authorizer_context = {
+            "email": claims.get("email"),
+            "sub": claims.get("sub"),
+            "name": claims.get("name"),
+            "hd": claims.get("hd", None),
+            "org_id": claims.get("org_id"),
+            "org_name": claims.get("org_name"),
+        }
+        if os.environ.get("AUTHORIZER_EVALUATE_FLAGS", "true").lower() == "true":
+            # Cached with the authorizer decision, so handlers skip LaunchDarkly
+            authorizer_context.update(_get_entitlements(claims))
         return build_response(
             claims['sub'],
-            get_policy_document('Allow', method_arn), {
-                "email": claims.get("email"),
-                "sub": claims.get("sub"),
-                "name": claims.get("name"),
-                "hd": claims.get("hd", None),
-                "org_id": claims.get("org_id"),
-                "org_name": claims.get("org_name"),
-            }
+            get_policy_document('Allow', method_arn),
+            authorizer_context
         )
     except Exception as e:
         logger.error(f"Exception in lambda_handler: {e}")
@@ -3,11 +3,13 @@ import json
 from EventCoord.utils.types import APIGatewayProxyEvent
 from aws_lambda_typing.context import Context as LambdaContext
 from EventCoord.utils.types import APIGatewayProxyResponse
-from EventCoord.launchdarkly.flags import Flags
+from EventCoord.launchdarkly.flags import get_flags
 from EventCoord.models.locations import Location
-from EventCoord.utils.csv_export import items_to_csv
-from EventCoord.utils.csv_import import build_natural_key, parse_csv_rows, prune_empty_fields
+from EventCoord.utils.csv_export import export_csv
+from EventCoord.utils.csv_import import apply_updates, parse_csv_rows, plan_import
+from EventCoord.utils.pagination import get_page_params, page_headers
 from EventCoord.utils.response import build_response
+from EventCoord.utils.update_expression import VersionConflictError
 from EventCoord.utils.handler import CORS_HEADERS, get_claims, get_logger, init_tracing
 
 init_tracing()
@@ -21,7 +23,7 @@ def lambda_handler(
     logger.debug(f"Locations event: {event}")
     logger.debug(f"Locations context: {context}")
     claims = get_claims(event)
-    flags = Flags(claims)
+    flags = get_flags(event, claims)
     org_id = claims.get('org_id')
     if not org_id:
         return build_response(
@@ -37,8 +39,13 @@ def lambda_handler(
 
     if method == 'GET':
         if resource_path.endswith('/export'):
-            items = Location.list(org_id)
-            csv_body = items_to_csv(items, exclude_fields={'org_id', 'locationId'})
+            params = event.get('queryStringParameters') or {}
+            csv_body = ''.join(export_csv(
+                lambda: Location.iter_list(org_id),
+                exclude_fields={'org_id', 'locationId', 'version'},
+                fieldnames=Location.CSV_FIELDS if params.get('columns') == 'schema' else None,
+                preferred=Location.CSV_FIELDS,
+            ))
             headers = {
                 **CORS_HEADERS,
                 'Content-Type': 'text/csv; charset=utf-8',
@@ -55,8 +62,19 @@ def lambda_handler(
                 )
             return build_response(200, item, headers=CORS_HEADERS)
         else:
-            items = Location.list(org_id)
-            return build_response(200, items, headers=CORS_HEADERS)
+            try:
+                limit, start_key = get_page_params(event, org_id)
+            except ValueError as e:
+                return build_response(400, {'error': str(e)}, headers=CORS_HEADERS)
+            if limit is None:
+                items = Location.list(org_id)
+                return build_response(200, items, headers=CORS_HEADERS)
+            items, last_key = Location.list_page(org_id, limit, start_key)
+            return build_response(
+                200,
+                items,
+                headers=page_headers(CORS_HEADERS, last_key)
+            )
 
     elif method == 'POST':
         if resource_path.endswith('/import'):
@@ -70,47 +88,20 @@ def lambda_handler(
                     headers=CORS_HEADERS
                 )
             rows = parse_csv_rows(body)
-            existing = Location.list(org_id)
-            existing_map = {}
-            for item in existing:
-                key = build_natural_key(item, ['name'])
-                if key:
-                    existing_map[key] = item
-            created = updated = skipped = 0
-            errors = []
-            for index, row in enumerate(rows, start=2):
-                row.pop('org_id', None)
-                row.pop('locationId', None)
-                key = build_natural_key(row, ['name'])
-                if not key:
-                    skipped += 1
-                    errors.append({'row': index, 'error': 'Missing name'})
-                    continue
-                existing_item = existing_map.get(key)
-                if existing_item:
-                    updates = prune_empty_fields(row)
-                    if not updates:
-                        skipped += 1
-                        continue
-                    merged = {**existing_item, **updates}
-                    merged.pop('org_id', None)
-                    merged.pop('locationId', None)
-                    Location.update(org_id, existing_item['locationId'], merged)
-                    updated += 1
-                else:
-                    created_item = Location.create(org_id, row)
-                    created += 1
-                    existing_map[key] = created_item
-            return build_response(
-                200,
-                {
-                    'created': created,
-                    'updated': updated,
-                    'skipped': skipped,
-                    'errors': errors,
-                },
-                headers=CORS_HEADERS
+            plan = plan_import(
+                rows,
+                Location.iter_list(org_id),
+                key_fields=['name'],
+                id_field='locationId',
+                missing_key_error='Missing name',
+            )
+            Location.create_many(org_id, plan.creates)
+            apply_updates(
+                plan,
+                lambda item_id, changes, version: Location.update(
+                    org_id, item_id, changes, expected_version=version),
             )
+            return build_response(200, plan.summary(), headers=CORS_HEADERS)
         import uuid
         body = json.loads(event.get('body') or '{}')
         if 'locationId' not in body:
@@ -131,10 +122,18 @@ def lambda_handler(
                 headers=CORS_HEADERS
             )
         body = json.loads(event.get('body') or '{}')
-        Location.update(org_id, location_id, body)
+        expected_version = body.pop('version', None)
+        try:
+            item = Location.update(org_id, location_id, body, expected_version)
+        except VersionConflictError:
+            return build_response(
+                409,
+                {'error': 'Location was modified by another request'},
+                headers=CORS_HEADERS
+            )
         return build_response(
             200,
-            {'message': 'Location updated', 'id': location_id},
+            {'message': 'Location updated', 'id': location_id, 'version': item.get('version')},
             headers=CORS_HEADERS
         )
 
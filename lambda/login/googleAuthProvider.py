@@ -1,58 +1,51 @@
 import logging
 import time
-import requests
 import json
 from authlib.jose import JsonWebToken, JWTClaims
 from typing import Tuple, Optional, Dict, Any
-from EventCoord.models.organizations import Organization
+from authlib.jose.errors import InvalidClaimError
+from EventCoord.client.jwks import get_jwks_cache
+from EventCoord.models.organizations import AudienceIndex, Organization
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
-valid_auds = [org['aud']
-              for org in Organization.list_all() if 'aud' in org]
-logger.debug(f"Valid audiences (aud): {valid_auds}")
+# Google publishes Cache-Control max-age on its certs, which sets the refresh interval
+google_jwks = get_jwks_cache(JWKS_URL)
+# Loaded on first login rather than at import so cold starts skip the scan
+valid_auds = AudienceIndex()
 
 
 class GoogleAuthProvider:
     def validate_google_id_token(self, token: str) -> Optional[JWTClaims]:
-        max_retries = 3
-        for attempt in range(1, max_retries + 1):
-            try:
-                logger.info(
-                    f"Validating Google ID token: {token[:10]}... (truncated)")
-                resp = requests.get(JWKS_URL, timeout=5)
-                logger.debug("JWKS endpoint responded")
-                resp.raise_for_status()
-                logger.debug("JWKS response status OK")
-                jwks = resp.json()['keys']
-                logger.debug(f"JWKS keys: {jwks}")
-                jwt_obj = JsonWebToken(['RS256'])
-                logger.debug("About to decode JWT")
-                claims = jwt_obj.decode(
-                    token,
-                    jwks,
-                    claims_options={
-                        "iss": {
-                            "essential": True,
-                            "values": ['accounts.google.com', 'https://accounts.google.com']
-                        },
-                        "aud": {
-                            "essential": True,
-                            "values": valid_auds
-                        }
+        try:
+            logger.info(
+                f"Validating Google ID token: {token[:10]}... (truncated)")
+            jwt_obj = JsonWebToken(['RS256'])
+            logger.debug("About to decode JWT")
+            claims = jwt_obj.decode(
+                token,
+                google_jwks.load_key,
+                claims_options={
+                    "iss": {
+                        "essential": True,
+                        "values": ['accounts.google.com', 'https://accounts.google.com']
+                    },
+                    "aud": {
+                        "essential": True,
                     }
-                )
-                logger.debug("Decoded JWT, about to validate")
-                claims.validate(now=int(time.time()), leeway=3)
-                logger.info(f"Google ID token is valid: {claims}")
-                return claims
-            except Exception as e:
-                logger.error(f"Google ID token validation failed: {e}")
-                if attempt == max_retries:
-                    logger.error("Max retries reached")
-                    return None
-                time.sleep(0.5 * attempt)
+                }
+            )
+            logger.debug("Decoded JWT, about to validate")
+            claims.validate(now=int(time.time()), leeway=3)
+            auds = claims['aud'] if isinstance(claims['aud'], list) else [claims['aud']]
+            if not any(aud in valid_auds for aud in auds):
+                raise InvalidClaimError('aud')
+            logger.info(f"Google ID token is valid: {claims}")
+            return claims
+        except Exception as e:
+            logger.error(f"Google ID token validation failed: {e}")
+            return None
 
     def authenticate(self, token: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
         try:
@@ -2,7 +2,6 @@ import os
 import json
 import time
 import copy
-import boto3
 from authlib.jose import jwt, JsonWebKey
 from typing import Protocol, Tuple, Optional, Dict, Any
 from EventCoord.utils.types import APIGatewayProxyEvent
@@ -12,6 +11,7 @@ from googleAuthProvider import GoogleAuthProvider
 # from EventCoord.models.volunteers import Volunteer
 from EventCoord.utils.response import build_response
 from EventCoord.utils.handler import get_logger, init_tracing
+from EventCoord.utils.resources import get_client
 
 init_tracing()
 logger = get_logger(__name__)
@@ -28,13 +28,61 @@ JWT_ISSUER = os.environ.get('JWT_ISSUER', 'event-coordinator-backend')
 TOKEN_TTL = int(os.environ.get('TOKEN_TTL', '3600'))
 
 
-def get_private_key():
+SIGNING_KEY_TTL = int(os.environ.get('SIGNING_KEY_TTL', '300'))
+
+# Parsed private key and kid for the secret version they were loaded from
+_signing_key: Dict[str, Any] = {}
+
+
+def _get_secrets_client():
+    return get_client('secretsmanager')
+
+
+def _current_version_id(client) -> Optional[str]:
+    versions = client.describe_secret(
+        SecretId=PRIVATE_KEY_SECRET_ARN).get('VersionIdsToStages', {})
+    for version_id, stages in versions.items():
+        if 'AWSCURRENT' in stages:
+            return version_id
+    return None
+
+
+def get_signing_key() -> Tuple[Any, Optional[str]]:
+    """
+    Return the parsed private key and its kid. Both are kept for
+    SIGNING_KEY_TTL seconds; after that a describe_secret call checks for
+    rotation and the secret is only re-read when its version changed.
+    """
     if not PRIVATE_KEY_SECRET_ARN:
         logger.error("JWT_PRIVATE_KEY_SECRET_ARN not set in environment")
         raise Exception("JWT_PRIVATE_KEY_SECRET_ARN not set")
-    client = boto3.client('secretsmanager')
+    now = time.monotonic()
+    if _signing_key and now < _signing_key['expires_at']:
+        return _signing_key['key'], _signing_key['kid']
+    client = _get_secrets_client()
+    if _signing_key:
+        try:
+            current_version_id = _current_version_id(client)
+        except Exception as e:
+            # A parsed key is in hand; keep signing with it rather than fail logins
+            logger.warning(f"Could not check signing key rotation, keeping cached key: {e}")
+            current_version_id = _signing_key['version_id']
+        if current_version_id == _signing_key['version_id']:
+            _signing_key['expires_at'] = now + SIGNING_KEY_TTL
+            return _signing_key['key'], _signing_key['kid']
     response = client.get_secret_value(SecretId=PRIVATE_KEY_SECRET_ARN)
-    return response['SecretString']
+    # Generate kid from the private key so it matches the JWKS
+    jwk = JsonWebKey.import_key(response['SecretString'], {"kty": "RSA"})
+    jwk_dict = jwk.as_dict() if hasattr(jwk, "as_dict") else None
+    _signing_key.update(
+        key=jwk,
+        kid=jwk_dict.get("kid") if jwk_dict else None,
+        version_id=response.get('VersionId'),
+        expires_at=now + SIGNING_KEY_TTL,
+    )
+    logger.info(
+        f"Loaded signing key version {_signing_key['version_id']} (kid {_signing_key['kid']})")
+    return _signing_key['key'], _signing_key['kid']
 
 
 class AuthProvider(Protocol):
@@ -83,11 +131,7 @@ def lambda_handler(
         payload = copy.deepcopy(user_info) if user_info else {}
         payload['iss'] = str(JWT_ISSUER)
         payload['exp'] = int(time.time()) + TOKEN_TTL
-        private_key = get_private_key()
-        # Generate kid from the private key so it matches the JWKS
-        jwk = JsonWebKey.import_key(private_key, {"kty": "RSA"})
-        jwk_dict = jwk.as_dict() if hasattr(jwk, "as_dict") else None
-        key_id = jwk_dict.get("kid") if jwk_dict else None
+        private_key, key_id = get_signing_key()
         header = {"alg": "RS256", "typ": "JWT"}
         header["jku"] = f"{JWT_ISSUER}/.well-known/jwks.json"
         if key_id:
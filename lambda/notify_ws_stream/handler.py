@@ -1,21 +1,59 @@
 import os
 import json
-import boto3
+import time
+import hashlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from aws_lambda_typing.events import DynamoDBStreamEvent
 from aws_lambda_typing.context import Context as LambdaContext
-from boto3.dynamodb.types import TypeDeserializer
 from boto3.dynamodb.conditions import Key
 from typing import Any
+from EventCoord.utils.batch import batch_write
+from EventCoord.utils.cache import TTLCache
+from EventCoord.utils.connections import is_expired, needs_touch, touch_values
 from EventCoord.utils.handler import get_logger, init_tracing
+from EventCoord.utils.resources import LazyTable, get_client
+from EventCoord.utils.stream import StreamImage, encode_message, image_diff
+from EventCoord.utils.subscriptions import TOPIC_SCOPES, is_subscribed
 
 init_tracing()
 logger = get_logger(__name__)
 
-deserializer = TypeDeserializer()
-dynamodb = boto3.resource('dynamodb')
-TABLE_NAME = os.environ.get('WS_CONNECTIONS_TABLE', 'WebSocketConnections')
-table: Any = dynamodb.Table(TABLE_NAME)  # type: ignore
+table: Any = LazyTable('WS_CONNECTIONS_TABLE', 'WebSocketConnections')
 WS_API_ENDPOINT = os.environ['WS_API_ENDPOINT']
+# Concurrent post_to_connection calls, the connect/read timeout of each,
+# and how long before the Lambda deadline fan-out stops waiting for posts
+FANOUT_CONCURRENCY = int(os.environ.get('WS_FANOUT_CONCURRENCY', '16'))
+POST_TIMEOUT = float(os.environ.get('WS_POST_TIMEOUT', '3'))
+FANOUT_RESERVE = float(os.environ.get('WS_FANOUT_RESERVE_MS', '1000')) / 1000
+_executor = ThreadPoolExecutor(max_workers=FANOUT_CONCURRENCY)
+# "refresh" sends only the <entity>Updated signal; "delta" also sends the
+# changed item or attribute diff, falling back to the signal when a group
+# of changes is too large or too many
+MESSAGE_MODE = os.environ.get('WS_MESSAGE_MODE', 'refresh')
+DELTA_MAX_BYTES = int(os.environ.get('WS_DELTA_MAX_BYTES', '16384'))
+DELTA_MAX_PER_BATCH = int(os.environ.get('WS_DELTA_MAX_PER_BATCH', '25'))
+# Bookkeeping attributes whose changes alone do not notify anyone, per
+# table name with "*" applying to every table
+IGNORED_ATTRIBUTES = json.loads(
+    os.environ.get('WS_IGNORED_ATTRIBUTES') or '{"*": ["version"]}')
+
+
+# Sequence numbers already pushed, per (connection id, payload digest), so
+# a retried batch does not push them again. One entry per message and
+# connection, however many records a coalesced message stands for. Shard
+# batches are retried in order, normally on the same warm container
+_delivered: TTLCache[frozenset] = TTLCache(
+    int(os.environ.get('WS_DELIVERED_CACHE_SIZE', '10000')),
+    int(os.environ.get('WS_DELIVERED_CACHE_TTL', '3600')))
+# Post errors worth retrying the records for; anything else (e.g.
+# ForbiddenException, PayloadTooLargeException) would fail again
+RETRYABLE_ERRORS = {
+    'LimitExceededException', 'ThrottlingException', 'TooManyRequestsException'}
+
+
+def ignored_attributes(table_name):
+    return set(IGNORED_ATTRIBUTES.get('*', [])) | set(IGNORED_ATTRIBUTES.get(table_name, []))
 
 
 def get_table_from_arn(arn):
@@ -25,96 +63,302 @@ def get_table_from_arn(arn):
     return table
 
 
-def notify_connections(org_id, message):
-    logger.info(
-        f"Notifying connections for org_id={org_id} with message={message}")
-    try:
-        resp = table.query(KeyConditionExpression=Key('orgId').eq(org_id))
-    except Exception as e:
-        logger.error(f"Error querying table for org_id={org_id}: {e}")
-        return
-    apigw = boto3.client('apigatewaymanagementapi',
-                         endpoint_url=WS_API_ENDPOINT)
-    for conn in resp.get('Items', []):
+# Source table -> message action. Messages also carry the table's
+# subscription scope attributes (see TOPIC_SCOPES)
+ROUTES = {
+    'volunteers': 'volunteersUpdated',
+    'assignments': 'assignmentsUpdated',
+    'periods': 'periodsUpdated',
+    'units': 'unitsUpdated',
+    'incidents': 'incidentsUpdated',
+    'locations': 'locationsUpdated',
+    'radios': 'radiosUpdated',
+}
+ROUTED_EVENTS = ('INSERT', 'MODIFY', 'REMOVE')
+
+
+def get_apigw():
+    # One attempt per post keeps a hung connection to about 2 * POST_TIMEOUT;
+    # undelivered records are retried by the event source mapping instead
+    return get_client(
+        'apigatewaymanagementapi', endpoint_url=WS_API_ENDPOINT,
+        connect_timeout=POST_TIMEOUT, read_timeout=POST_TIMEOUT,
+        retries={'mode': 'standard', 'total_max_attempts': 1})
+
+
+def get_connections(org_id):
+    """The org's live connections; expired ones await DynamoDB TTL deletion."""
+    resp = table.query(KeyConditionExpression=Key('orgId').eq(org_id))
+    return [conn for conn in resp.get('Items', []) if not is_expired(conn)]
+
+
+def _delivery_key(connection_id, payload):
+    return connection_id, hashlib.sha256(payload).hexdigest()
+
+
+def is_delivered(connection_id, payload, seqs):
+    delivered = _delivered.get(_delivery_key(connection_id, payload)) or frozenset()
+    return delivered.issuperset(seqs)
+
+
+def _mark_delivered(connection_id, payload, seqs):
+    key = _delivery_key(connection_id, payload)
+    _delivered.set(key, (_delivered.get(key) or frozenset()) | frozenset(seqs))
+
+
+def is_retryable(error):
+    """Throttling, 5xx and transport errors (no service response) are retried."""
+    response = getattr(error, 'response', None)
+    if not response:
+        return True
+    code = response.get('Error', {}).get('Code')
+    status = response.get('ResponseMetadata', {}).get('HTTPStatusCode') or 0
+    return code in RETRYABLE_ERRORS or status == 429 or status >= 500
+
+
+def _post(apigw, connection_id, payloads):
+    """
+    Send every (payload, sequence numbers) pair to one connection. Returns
+    the outcome and the sequence numbers to retry: those whose payloads
+    were not delivered because of a retryable error.
+    """
+    for i, (payload, seqs) in enumerate(payloads):
         try:
-            logger.debug(f"Posting to connection {conn['connectionId']}")
-            apigw.post_to_connection(
-                ConnectionId=conn['connectionId'], Data=json.dumps(message).encode('utf-8'))
+            apigw.post_to_connection(ConnectionId=connection_id, Data=payload)
         except apigw.exceptions.GoneException:
-            logger.info(
-                f"Stale connection {conn['connectionId']} detected, deleting.")
-            table.delete_item(
-                Key={'orgId': conn['orgId'], 'connectionId': conn['connectionId']})
+            return 'gone', set()
+        except Exception as e:
+            code = getattr(e, 'response', {}).get('Error', {}).get('Code')
+            logger.error(f"Error posting to connection {connection_id}: {e}")
+            retry = set()
+            if is_retryable(e):
+                retry = {seq for _, pending in payloads[i:] for seq in pending}
+            return f"error:{code or type(e).__name__}", retry
+        _mark_delivered(connection_id, payload, seqs)
+    return 'sent', set()
+
+
+def touch_connections(keys):
+    """
+    Extend the expiry of connections that were reached. Runs on the calling
+    thread, as the boto3 Table resource is not safe to share with workers.
+    """
+    expression_values = touch_values()
+    for key in keys:
+        # UpdateItem rather than a batched put so concurrent subscription
+        # changes on the item are not overwritten
+        try:
+            table.update_item(
+                Key=key,
+                UpdateExpression="SET lastSeen = :seen, expiresAt = :expires",
+                ConditionExpression="attribute_exists(connectionId)",
+                ExpressionAttributeValues=expression_values,
+            )
+        except Exception as e:
+            logger.warning(f"Error refreshing connection {key['connectionId']}: {e}")
+
+
+def fan_out(sends, deadline=None):
+    """
+    Post to connections concurrently. `sends` is a list of (connection item,
+    [(payload, sequence numbers)]). Once the posts complete, stale
+    connections are removed with one batched delete and reached ones due a
+    refresh have their expiry extended. Posts still pending at `deadline` (a
+    time.monotonic() value) count as 'timeout'. Returns a Counter of outcomes ('sent', 'gone',
+    'timeout', 'error:<code>') and the sequence numbers that were not
+    delivered.
+    """
+    stats = Counter()
+    failed = set()
+    if not sends:
+        return stats, failed
+    apigw = get_apigw()
+    futures = [
+        (conn, payloads, _executor.submit(_post, apigw, conn['connectionId'], payloads))
+        for conn, payloads in sends
+    ]
+    stale = []
+    touch = []
+    for conn, payloads, future in futures:
+        timeout = None if deadline is None else max(0, deadline - time.monotonic())
+        try:
+            outcome, undelivered = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            outcome = 'timeout'
+            undelivered = {seq for _, seqs in payloads for seq in seqs}
+        stats[outcome] += 1
+        failed |= undelivered
+        key = {'orgId': conn['orgId'], 'connectionId': conn['connectionId']}
+        if outcome == 'gone':
+            stale.append(key)
+        elif outcome == 'sent' and needs_touch(conn):
+            touch.append(key)
+    if stale:
+        logger.info(f"Deleting {len(stale)} stale connections")
+        try:
+            batch_write(table, delete_keys=stale)
         except Exception as e:
-            logger.error(
-                f"Error posting to connection {conn['connectionId']}: {e}")
+            logger.error(f"Error deleting stale connections: {e}")
+    touch_connections(touch)
+    return stats, failed
+
+
+def build_sends(org_id, notifications):
+    """
+    Pair each of the org's connections with the payloads it subscribed to
+    and has not already received. `notifications` is a list of (entity,
+    message, sequence numbers of the records behind it).
+    """
+    logger.info(
+        f"Preparing notifications for org_id={org_id}: {notifications}")
+    encoded = [
+        (entity, message, encode_message(message), seqs)
+        for entity, message, seqs in notifications
+    ]
+    sends = []
+    for conn in get_connections(org_id):
+        payloads = [
+            (payload, seqs) for entity, message, payload, seqs in encoded
+            if is_subscribed(conn.get('subscriptions'), entity, message)
+            and not is_delivered(conn['connectionId'], payload, seqs)
+        ]
+        if payloads:
+            sends.append((conn, payloads))
+    return sends
+
+
+def build_delta(event_name, message, keys, new_item, diff):
+    delta = {**message, "event": event_name, "key": keys}
+    if event_name == 'INSERT':
+        delta["item"] = new_item.to_dict()
+    elif event_name == 'MODIFY':
+        delta["changes"], delta["removed"] = diff
+    return delta
+
+
+def route_record(record):
+    """
+    Return the (org_id, entity, message, delta) a stream record produces, or
+    None. `delta` is only built in delta mode.
+    """
+    event_name = record.get('eventName')
+    table_arn = record.get('eventSourceARN')
+    if not table_arn:
+        logger.warning(f"Missing eventSourceARN in record: {record}")
+        return None
+    table_name = get_table_from_arn(table_arn)
+    action = ROUTES.get(table_name)
+    if action is None or event_name not in ROUTED_EVENTS:
+        logger.debug(
+            f"No routing match for table {table_name} and event {event_name}")
+        return None
+    # Attributes are deserialized on access; routing only reads org_id and
+    # the scope fields, and a MODIFY diff only the attributes that changed
+    new_item = StreamImage(record.get('dynamodb', {}).get('NewImage'))
+    old_item = StreamImage(record.get('dynamodb', {}).get('OldImage'))
+
+    item = new_item or old_item
+    if not item:
+        logger.warning(f"No item found in record: {record}")
+        return None  # Skip if both new_item and old_item are None
+
+    diff = None
+    if event_name == 'MODIFY':
+        diff = image_diff(old_item, new_item)
+        ignored = ignored_attributes(table_name)
+        changed, removed = diff
+        if not any(k not in ignored for k in (*changed, *removed)):
+            logger.debug(
+                f"Skipping no-op MODIFY for table {table_name}: {sorted(changed) + removed}")
+            return None
+
+    logger.info(
+        f"Processing {event_name} for table {table_name} and org_id={item.get('org_id')}")
+    org_id = item['org_id']
+    message = {"action": action, "orgId": org_id}
+    for field in TOPIC_SCOPES.get(table_name, ()):
+        message[field] = item.get(field)
+    delta = None
+    if MESSAGE_MODE == 'delta':
+        keys = StreamImage(record.get('dynamodb', {}).get('Keys')).to_dict()
+        delta = build_delta(event_name, message, keys, new_item, diff)
+    return org_id, table_name, message, delta
+
+
+def select_messages(group):
+    """
+    Deltas for a group of changes when they are small and few, else the
+    refresh signal. Returns (message, sequence numbers) pairs.
+    """
+    deltas = group['deltas']
+    refresh = [(group['message'], tuple(group['seqs']))]
+    if not deltas or group['repeated'] or len(deltas) > DELTA_MAX_PER_BATCH:
+        return refresh
+    if any(len(encode_message(delta)) > DELTA_MAX_BYTES for delta, _ in deltas.values()):
+        return refresh
+    return [(delta, (seq,)) for delta, seq in deltas.values()]
+
+
+def batch_item_failures(seqs):
+    return {"batchItemFailures": [
+        {"itemIdentifier": seq} for seq in sorted(seqs, key=int)]}
 
 
 def lambda_handler(
     event: DynamoDBStreamEvent,
     context: LambdaContext
-) -> None:
+) -> dict:
     logger.info(f"Received event: {json.dumps(event)[:1000]}")
     logger.debug(f"Received event (full): {json.dumps(event)}")
+    # Sequence numbers of records to retry; Lambda resumes the shard from
+    # the lowest one, and records already pushed are skipped per connection
+    failed = set()
+    # Reduce the batch to unique (org, action, scope) notifications so a
+    # bulk import produces one message per client rather than one per record
+    by_org = {}
     for record in event['Records']:
-        event_name = record.get('eventName')
-        table_arn = record.get('eventSourceARN')
-        if not table_arn:
-            logger.warning(f"Missing eventSourceARN in record: {record}")
+        seq = record.get('dynamodb', {}).get('SequenceNumber')
+        try:
+            routed = route_record(record)
+        except Exception as e:
+            # Routing only reads the record, so a retry would fail the same way
+            logger.error(f"Dropping unroutable record {seq}: {e}", exc_info=True)
             continue
-        table_name = get_table_from_arn(table_arn)
-        new_image = record.get('dynamodb', {}).get('NewImage')
-        old_image = record.get('dynamodb', {}).get('OldImage')
-        if new_image:
-            new_item = {k: deserializer.deserialize(
-                v) for k, v in new_image.items()}
-        else:
-            new_item = None
-        if old_image:
-            old_item = {k: deserializer.deserialize(
-                v) for k, v in old_image.items()}
-        else:
-            old_item = None
-
-        # Routing logic by table and event type
-        item = new_item or old_item
-        if not item:
-            logger.warning(f"No item found in record: {record}")
-            continue  # Skip if both new_item and old_item are None
-
-        logger.info(
-            f"Processing {event_name} for table {table_name} and org_id={item.get('org_id')}")
-
-        if table_name == 'volunteers' and event_name in ('INSERT', 'MODIFY', 'REMOVE'):
-            org_id = item['org_id']
-            period_id = item.get('periodId')
-            notify_connections(
-                org_id, {"action": "volunteersUpdated", "orgId": org_id, "periodId": period_id})
-        elif table_name == 'assignments' and event_name in ('INSERT', 'MODIFY', 'REMOVE'):
-            org_id = item['org_id']
-            period_id = item.get('periodId')
-            notify_connections(
-                org_id, {"action": "assignmentsUpdated", "orgId": org_id, "periodId": period_id})
-        elif table_name == 'periods' and event_name in ('INSERT', 'MODIFY', 'REMOVE'):
-            org_id = item['org_id']
-            notify_connections(
-                org_id, {"action": "periodsUpdated", "orgId": org_id})
-        elif table_name == 'units' and event_name in ('INSERT', 'MODIFY', 'REMOVE'):
-            org_id = item['org_id']
-            notify_connections(
-                org_id, {"action": "unitsUpdated", "orgId": org_id})
-        elif table_name == 'incidents' and event_name in ('INSERT', 'MODIFY', 'REMOVE'):
-            org_id = item['org_id']
-            notify_connections(
-                org_id, {"action": "incidentsUpdated", "orgId": org_id})
-        elif table_name == 'locations' and event_name in ('INSERT', 'MODIFY', 'REMOVE'):
-            org_id = item['org_id']
-            notify_connections(
-                org_id, {"action": "locationsUpdated", "orgId": org_id})
-        elif table_name == 'radios' and event_name in ('INSERT', 'MODIFY', 'REMOVE'):
-            org_id = item['org_id']
-            notify_connections(
-                org_id, {"action": "radiosUpdated", "orgId": org_id})
-        else:
-            logger.debug(
-                f"No routing match for table {table_name} and event {event_name}")
+        if routed is None:
+            continue
+        org_id, entity, message, delta = routed
+        key = tuple(sorted(message.items(), key=lambda kv: kv[0]))
+        group = by_org.setdefault(org_id, {}).setdefault(key, {
+            'entity': entity, 'message': message, 'seqs': [],
+            'deltas': {}, 'repeated': False})
+        group['seqs'].append(seq)
+        if delta is not None:
+            item_key = tuple(sorted(delta['key'].items(), key=lambda kv: kv[0]))
+            # Several changes to one item in a batch are not merged; send a refresh
+            group['repeated'] = group['repeated'] or item_key in group['deltas']
+            group['deltas'][item_key] = (delta, seq)
+    sends = []
+    for org_id, groups in by_org.items():
+        notifications = [
+            (group['entity'], message, seqs)
+            for group in groups.values()
+            for message, seqs in select_messages(group)
+        ]
+        try:
+            sends.extend(build_sends(org_id, notifications))
+        except Exception as e:
+            logger.error(f"Error preparing notifications for org_id={org_id}: {e}")
+            failed.update(seq for group in groups.values() for seq in group['seqs'])
+    deadline = None
+    if context is not None:
+        deadline = (time.monotonic() + context.get_remaining_time_in_millis() / 1000
+                    - FANOUT_RESERVE)
+    stats, undelivered = fan_out(sends, deadline)
+    failed |= undelivered
+    if stats:
+        logger.info(f"Fan-out to {len(sends)} connections: {dict(stats)}")
+    failed.discard(None)
+    if failed:
+        logger.warning(f"Reporting {len(failed)} failed records for retry")
+    return batch_item_failures(failed)
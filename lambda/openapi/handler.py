@@ -1,11 +1,10 @@
-import os
-import boto3
 import json
 from EventCoord.utils.types import APIGatewayProxyEvent
 from aws_lambda_typing.context import Context as LambdaContext
 from EventCoord.utils.types import APIGatewayProxyResponse
 from EventCoord.utils.response import build_response
 from EventCoord.utils.handler import get_logger, init_tracing
+from EventCoord.utils.resources import get_client
 
 init_tracing()
 logger = get_logger(__name__)
@@ -24,7 +23,7 @@ def lambda_handler(
     requestContext = event.get('requestContext', {})
     rest_api_id = requestContext.get('apiId')
     stage_name = requestContext.get('stage')
-    client = boto3.client('apigateway')
+    client = get_client('apigateway')
     try:
         response = client.get_export(
             restApiId=rest_api_id,
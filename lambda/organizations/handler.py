@@ -1,13 +1,12 @@
-import os
-import uuid
-import boto3
 import json
 from EventCoord.utils.types import APIGatewayProxyEvent
 from aws_lambda_typing.context import Context as LambdaContext
 from EventCoord.utils.types import APIGatewayProxyResponse
-from EventCoord.launchdarkly.flags import Flags
+from EventCoord.launchdarkly.flags import get_flags
 from EventCoord.models.organizations import Organization
+from EventCoord.utils.pagination import get_page_params, page_headers
 from EventCoord.utils.response import build_response
+from EventCoord.utils.update_expression import VersionConflictError
 from EventCoord.utils.handler import CORS_HEADERS, get_claims, get_logger, init_tracing
 
 init_tracing()
@@ -21,7 +20,7 @@ def lambda_handler(
     logger.debug(f"Organizations event: {event}")
     logger.debug(f"Organizations context: {context}")
     claims = get_claims(event)
-    flags = Flags(claims)
+    flags = get_flags(event, claims)
     method = event.get('httpMethod', 'GET')
     path_params = event.get('pathParameters') or {}
     org_id = path_params.get('org_id') if path_params else None
@@ -47,8 +46,19 @@ def lambda_handler(
                 )
             return build_response(200, org, headers=CORS_HEADERS)
         else:
-            items = Organization.list_all()
-            return build_response(200, items, headers=CORS_HEADERS)
+            try:
+                limit, start_key = get_page_params(event)
+            except ValueError as e:
+                return build_response(400, {'error': str(e)}, headers=CORS_HEADERS)
+            if limit is None:
+                items = Organization.list_all()
+                return build_response(200, items, headers=CORS_HEADERS)
+            items, last_key = Organization.list_page(limit, start_key)
+            return build_response(
+                200,
+                items,
+                headers=page_headers(CORS_HEADERS, last_key)
+            )
 
     elif method == 'POST':
         body = json.loads(event.get('body') or '{}')
@@ -92,7 +102,14 @@ def lambda_handler(
                 {'error': 'No valid fields to update'},
                 headers=CORS_HEADERS
             )
-        org = Organization.update(org_id, updates)
+        try:
+            org = Organization.update(org_id, updates, body.get('version'))
+        except VersionConflictError:
+            return build_response(
+                409,
+                {'error': 'Organization was modified by another request'},
+                headers=CORS_HEADERS
+            )
         if not org:
             return build_response(
                 404,
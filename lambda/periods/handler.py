@@ -3,17 +3,25 @@ import json
 from EventCoord.utils.types import APIGatewayProxyEvent
 from aws_lambda_typing.context import Context as LambdaContext
 from EventCoord.utils.types import APIGatewayProxyResponse
-from EventCoord.launchdarkly.flags import Flags
+from EventCoord.launchdarkly.flags import get_flags
 from EventCoord.models.periods import Period
-from EventCoord.utils.csv_export import items_to_csv
-from EventCoord.utils.csv_import import build_natural_key, parse_csv_rows, prune_empty_fields
+from EventCoord.utils.csv_export import export_csv
+from EventCoord.utils.csv_import import apply_updates, parse_csv_rows, plan_import
+from EventCoord.utils.pagination import get_page_params, page_headers
 from EventCoord.utils.response import build_response
+from EventCoord.utils.update_expression import VersionConflictError
 from EventCoord.utils.handler import CORS_HEADERS, get_claims, get_logger, init_tracing
 
 init_tracing()
 logger = get_logger(__name__)
 
 
+def _validate_period_create(row):
+    if not row.get('incidentId'):
+        return 'Missing incidentId'
+    return None
+
+
 def lambda_handler(
     event: APIGatewayProxyEvent,
     context: LambdaContext
@@ -21,7 +29,7 @@ def lambda_handler(
     logger.debug(f"Periods event: {event}")
     logger.debug(f"Periods context: {context}")
     claims = get_claims(event)
-    flags = Flags(claims)
+    flags = get_flags(event, claims)
     org_id = claims.get('org_id')
     if not org_id:
         return build_response(
@@ -37,8 +45,13 @@ def lambda_handler(
 
     if method == 'GET':
         if resource_path.endswith('/export'):
-            items = Period.list(org_id)
-            csv_body = items_to_csv(items, exclude_fields={'org_id', 'periodId'})
+            params = event.get('queryStringParameters') or {}
+            csv_body = ''.join(export_csv(
+                lambda: Period.iter_list(org_id),
+                exclude_fields={'org_id', 'periodId', 'version'},
+                fieldnames=Period.CSV_FIELDS if params.get('columns') == 'schema' else None,
+                preferred=Period.CSV_FIELDS,
+            ))
             headers = {
                 **CORS_HEADERS,
                 'Content-Type': 'text/csv; charset=utf-8',
@@ -55,8 +68,19 @@ def lambda_handler(
                 )
             return build_response(200, item, headers=CORS_HEADERS)
         else:
-            items = Period.list(org_id)
-            return build_response(200, items, headers=CORS_HEADERS)
+            try:
+                limit, start_key = get_page_params(event, org_id)
+            except ValueError as e:
+                return build_response(400, {'error': str(e)}, headers=CORS_HEADERS)
+            if limit is None:
+                items = Period.list(org_id)
+                return build_response(200, items, headers=CORS_HEADERS)
+            items, last_key = Period.list_page(org_id, limit, start_key)
+            return build_response(
+                200,
+                items,
+                headers=page_headers(CORS_HEADERS, last_key)
+            )
 
     elif method == 'POST':
         if resource_path.endswith('/import'):
@@ -70,51 +94,21 @@ def lambda_handler(
                     headers=CORS_HEADERS
                 )
             rows = parse_csv_rows(body)
-            existing = Period.list(org_id)
-            existing_map = {}
-            for item in existing:
-                key = build_natural_key(item, ['name', 'startTime'])
-                if key:
-                    existing_map[key] = item
-            created = updated = skipped = 0
-            errors = []
-            for index, row in enumerate(rows, start=2):
-                row.pop('org_id', None)
-                row.pop('periodId', None)
-                key = build_natural_key(row, ['name', 'startTime'])
-                if not key:
-                    skipped += 1
-                    errors.append({'row': index, 'error': 'Missing name or startTime'})
-                    continue
-                existing_item = existing_map.get(key)
-                if existing_item:
-                    updates = prune_empty_fields(row)
-                    if not updates:
-                        skipped += 1
-                        continue
-                    merged = {**existing_item, **updates}
-                    merged.pop('org_id', None)
-                    merged.pop('periodId', None)
-                    Period.update(org_id, existing_item['periodId'], merged)
-                    updated += 1
-                else:
-                    if not row.get('incidentId'):
-                        skipped += 1
-                        errors.append({'row': index, 'error': 'Missing incidentId'})
-                        continue
-                    created_item = Period.create(org_id, row['incidentId'], row)
-                    created += 1
-                    existing_map[key] = created_item
-            return build_response(
-                200,
-                {
-                    'created': created,
-                    'updated': updated,
-                    'skipped': skipped,
-                    'errors': errors,
-                },
-                headers=CORS_HEADERS
+            plan = plan_import(
+                rows,
+                Period.iter_list(org_id),
+                key_fields=['name', 'startTime'],
+                id_field='periodId',
+                missing_key_error='Missing name or startTime',
+                validate_create=_validate_period_create,
+            )
+            Period.create_many(org_id, plan.creates)
+            apply_updates(
+                plan,
+                lambda item_id, changes, version: Period.update(
+                    org_id, item_id, changes, expected_version=version),
             )
+            return build_response(200, plan.summary(), headers=CORS_HEADERS)
         # Create a new ICS-214 period
         import uuid
         body = json.loads(event.get('body') or '{}')
@@ -144,10 +138,18 @@ def lambda_handler(
                 headers=CORS_HEADERS
             )
         body = json.loads(event.get('body') or '{}')
-        Period.update(org_id, period_id, body)
+        expected_version = body.pop('version', None)
+        try:
+            item = Period.update(org_id, period_id, body, expected_version)
+        except VersionConflictError:
+            return build_response(
+                409,
+                {'error': 'Period was modified by another request'},
+                headers=CORS_HEADERS
+            )
         return build_response(
             200,
-            {'message': 'Period updated', 'id': period_id},
+            {'message': 'Period updated', 'id': period_id, 'version': item.get('version')},
             headers=CORS_HEADERS
         )
 
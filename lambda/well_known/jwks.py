@@ -1,16 +1,19 @@
 import os
+import json
+import time
+import hashlib
 import logging
-import boto3
 from authlib.jose import JsonWebKey
 from EventCoord.utils.response import build_response
-from aws_xray_sdk.core import patch_all, xray_recorder
+from EventCoord.utils.resources import enable_tracing, get_client
 
-patch_all()  # Automatically patches boto3, requests, etc.
-
-xray_recorder.configure(service='incident-cmd')
+enable_tracing('incident-cmd')
 
 # Use RSA public key from AWS Secrets Manager
 PUBLIC_KEY_SECRET_ARN = os.environ.get('JWT_PUBLIC_KEY_SECRET_ARN')
+# How long the published document is reused before checking for new
+# secret versions, and how long clients may cache it
+JWKS_CACHE_TTL = int(os.environ.get('JWKS_CACHE_TTL', '300'))
 
 # Setup logging
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
@@ -31,37 +34,86 @@ cors_headers = {
 }
 
 
-def get_public_keys():
+# Rendered JWKS document for the secret versions it was built from
+_jwks_cache = {}
+
+
+def _get_secrets_client():
+    return get_client('secretsmanager')
+
+
+def get_public_key_versions(client):
     if not PUBLIC_KEY_SECRET_ARN:
         raise Exception("JWT_PUBLIC_KEY_SECRET_ARN not set")
-    client = boto3.client('secretsmanager')
     # Get all version IDs for the secret
     versions = client.list_secret_version_ids(
         SecretId=PUBLIC_KEY_SECRET_ARN)['Versions']
     # Sort by CreatedDate descending (latest first)
     versions_sorted = sorted(
         versions, key=lambda v: v['CreatedDate'], reverse=True)
-    # Get up to 2 most recent versions
+    # Publish up to 2 most recent versions
+    return tuple(v['VersionId'] for v in versions_sorted[:2])
+
+
+def get_public_keys(client, version_ids):
     keys = []
-    for v in versions_sorted[:2]:
-        version_id = v['VersionId']
+    for version_id in version_ids:
         resp = client.get_secret_value(
             SecretId=PUBLIC_KEY_SECRET_ARN, VersionId=version_id)
         keys.append(resp['SecretString'])
     return keys
 
 
-def lambda_handler(event, context):
-    try:
-        public_keys_pem = get_public_keys()
+def get_jwks_document():
+    """
+    Return the JWKS body and its ETag. Within JWKS_CACHE_TTL no Secrets
+    Manager calls are made; after that only the version list is checked and
+    the keys are re-read when it changed.
+    """
+    now = time.monotonic()
+    if _jwks_cache and now < _jwks_cache['expires_at']:
+        return _jwks_cache['body'], _jwks_cache['etag']
+    client = _get_secrets_client()
+    version_ids = get_public_key_versions(client)
+    if _jwks_cache.get('version_ids') != version_ids:
         jwks_keys = []
-        for key_pem in public_keys_pem:
+        for key_pem in get_public_keys(client, version_ids):
             jwk = JsonWebKey.import_key(key_pem, {'kty': 'RSA'})
             jwks_keys.append(jwk.as_dict())
-        jwks = {"keys": jwks_keys}
+        body = json.dumps({"keys": jwks_keys})
+        _jwks_cache.update(
+            version_ids=version_ids,
+            body=body,
+            etag='"' + hashlib.sha256(body.encode('utf-8')).hexdigest()[:32] + '"',
+        )
         logger.info(
             f"JWKS published with {len(jwks_keys)} keys, kids: {[k.get('kid') for k in jwks_keys]}")
-        return build_response(200, jwks, headers=cors_headers)
+    _jwks_cache['expires_at'] = now + JWKS_CACHE_TTL
+    return _jwks_cache['body'], _jwks_cache['etag']
+
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or any(
+        tag[2:] == etag if tag.startswith('W/') else tag == etag for tag in candidates)
+
+
+def lambda_handler(event, context):
+    try:
+        body, etag = get_jwks_document()
+        headers = {
+            **cors_headers,
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={JWKS_CACHE_TTL}",
+        }
+        request_headers = {
+            k.lower(): v for k, v in ((event or {}).get('headers') or {}).items()}
+        if _etag_matches(request_headers.get('if-none-match'), etag):
+            return build_response(304, '', headers=headers)
+        return build_response(
+            200, body, headers={**headers, "Content-Type": "application/json"})
     except Exception as e:
         logger.error(f"Failed to publish JWKS: {e}", exc_info=True)
         return build_response(
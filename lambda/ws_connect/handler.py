@@ -1,16 +1,14 @@
-import os
-import boto3
 from aws_lambda_typing.events import WebSocketConnectEvent
 from aws_lambda_typing.context import Context as LambdaContext
 from typing import Any
+from EventCoord.utils.connections import connection_item
 from EventCoord.utils.handler import get_logger, init_tracing
+from EventCoord.utils.resources import LazyTable
 
 init_tracing()
 logger = get_logger(__name__)
 
-dynamodb = boto3.resource('dynamodb')
-TABLE_NAME = os.environ.get('WS_CONNECTIONS_TABLE', 'WebSocketConnections')
-table: Any = dynamodb.Table(TABLE_NAME)  # type: ignore
+table: Any = LazyTable('WS_CONNECTIONS_TABLE', 'WebSocketConnections')
 
 
 def lambda_handler(
@@ -25,12 +23,7 @@ def lambda_handler(
         logger.error("Missing org_id or user_id in authorizer context")
         return {"statusCode": 401, "body": "Unauthorized"}
     connection_id = event['requestContext']['connectionId']
-    item = {
-        'connectionId': connection_id,
-        'orgId': org_id,
-        'user': user_id,
-        'subscriptions': [],
-    }
+    item = connection_item(connection_id, org_id, user_id)
     try:
         table.put_item(Item=item)
         logger.info(f"Stored connection: {item}")
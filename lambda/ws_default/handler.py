@@ -1,12 +1,98 @@
 import json
-import os
 from aws_lambda_typing.events import WebSocketRouteEvent
 from aws_lambda_typing.context import Context as LambdaContext
+from botocore.exceptions import ClientError
+from typing import Any
+from EventCoord.utils.connections import connection_key, touch_values
 from EventCoord.utils.handler import get_logger, init_tracing
+from EventCoord.utils.resources import LazyTable
+from EventCoord.utils.subscriptions import merge_topics, normalize_topic, remove_topics
 
 init_tracing()
 logger = get_logger(__name__)
 
+table: Any = LazyTable('WS_CONNECTIONS_TABLE', 'WebSocketConnections')
+# Read-modify-write rounds for a subscription change racing another one
+SUBSCRIPTION_WRITE_ATTEMPTS = 3
+
+
+def not_found() -> dict[str, str | int]:
+    return {"statusCode": 404, "body": json.dumps({"type": "error", "error": "Connection not found"})}
+
+
+def touch_connection(event: WebSocketRouteEvent) -> None:
+    """Refresh lastSeen and the TTL of the event's connection."""
+    key = connection_key(event)
+    if key is None:
+        logger.warning("No connection key in ping event")
+        return
+    try:
+        table.update_item(
+            Key=key,
+            UpdateExpression="SET lastSeen = :seen, expiresAt = :expires",
+            ConditionExpression="attribute_exists(connectionId)",
+            ExpressionAttributeValues=touch_values(),
+        )
+    except Exception as e:
+        logger.error(f"Error refreshing connection {key['connectionId']}: {e}")
+
+
+def update_subscriptions(event: WebSocketRouteEvent, message: dict, subscribe: bool) -> dict[str, str | int]:
+    raw_topics = message.get('topics')
+    if raw_topics is None:
+        raw_topics = [{k: v for k, v in message.items() if k != 'action'}]
+    try:
+        if not isinstance(raw_topics, list) or not raw_topics:
+            raise ValueError("topics must be a non-empty list")
+        topics = [normalize_topic(raw) for raw in raw_topics]
+    except ValueError as e:
+        return {"statusCode": 400, "body": json.dumps({"type": "error", "error": str(e)})}
+    key = connection_key(event)
+    if key is None:
+        return not_found()
+    for _ in range(SUBSCRIPTION_WRITE_ATTEMPTS):
+        item = table.get_item(Key=key).get('Item')
+        if item is None:
+            return not_found()
+        # None means never subscribed (every topic); [] means no topics at all
+        current = item.get('subscriptions')
+        if subscribe:
+            subscriptions = merge_topics(current or [], topics)
+        elif current is None:
+            # Nothing to narrow: the connection still receives every topic
+            return {"statusCode": 200, "body": json.dumps({"type": "unsubscribed", "subscriptions": None})}
+        else:
+            subscriptions = remove_topics(current, topics)
+        # Only write over the value read, so concurrent changes are not lost
+        values = {':s': subscriptions, **touch_values()}
+        if current is None:
+            condition = "attribute_exists(connectionId) AND attribute_not_exists(subscriptions)"
+        else:
+            condition = "attribute_exists(connectionId) AND subscriptions = :old"
+            values[':old'] = current
+        try:
+            table.update_item(
+                Key=key,
+                UpdateExpression="SET subscriptions = :s, lastSeen = :seen, expiresAt = :expires",
+                ConditionExpression=condition,
+                ExpressionAttributeValues=values,
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+            # The connection was removed or its subscriptions changed; re-read
+            continue
+        logger.info(f"Subscriptions for {key['connectionId']}: {subscriptions}")
+        return {
+            "statusCode": 200,
+            "body": json.dumps({
+                "type": "subscribed" if subscribe else "unsubscribed",
+                "subscriptions": subscriptions,
+            }),
+        }
+    return {"statusCode": 409, "body": json.dumps({
+        "type": "error", "error": "Subscriptions changed concurrently, please retry"})}
+
 
 def lambda_handler(
     event: WebSocketRouteEvent,
@@ -20,9 +106,18 @@ def lambda_handler(
     except Exception as e:
         logger.error(f"Error parsing message body: {e}")
         message = {}
+    if not isinstance(message, dict):
+        message = {}
     action = message.get('action')
     if action == 'ping':
         logger.info("Received ping, responding with pong")
+        touch_connection(event)
         return {"statusCode": 200, "body": json.dumps({"type": "pong"})}
+    if action in ('subscribe', 'unsubscribe'):
+        try:
+            return update_subscriptions(event, message, action == 'subscribe')
+        except Exception as e:
+            logger.error(f"Error updating subscriptions: {e}")
+            return {"statusCode": 500, "body": json.dumps({"type": "error", "error": "Failed to update subscriptions"})}
     logger.info("No ping detected, responding with ack")
     return {"statusCode": 200, "body": json.dumps({"type": "ack"})}
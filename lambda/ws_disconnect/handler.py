@@ -1,17 +1,14 @@
-import os
-import boto3
 from aws_lambda_typing.events import WebSocketConnectEvent
 from aws_lambda_typing.context import Context as LambdaContext
-from boto3.dynamodb.conditions import Key
 from typing import Any
+from EventCoord.utils.connections import connection_key
 from EventCoord.utils.handler import get_logger, init_tracing
+from EventCoord.utils.resources import LazyTable
 
 init_tracing()
 logger = get_logger(__name__)
 
-dynamodb = boto3.resource('dynamodb')
-TABLE_NAME = os.environ.get('WS_CONNECTIONS_TABLE', 'WebSocketConnections')
-table: Any = dynamodb.Table(TABLE_NAME)  # type: ignore
+table: Any = LazyTable('WS_CONNECTIONS_TABLE', 'WebSocketConnections')
 
 
 def lambda_handler(
@@ -20,18 +17,14 @@ def lambda_handler(
 ) -> dict[str, str | int]:
     logger.info(f"Received $disconnect event: {event}")
     connection_id = event['requestContext']['connectionId']
+    key = connection_key(event)
+    if key is None:
+        # Left for the table's TTL to expire
+        logger.warning(f"No orgId in authorizer context for connectionId={connection_id}")
+        return {"statusCode": 404, "body": "Connection not found"}
     try:
-        resp = table.query(
-            IndexName="ConnectionIdIndex",
-            KeyConditionExpression=Key('connectionId').eq(connection_id)
-        )
-        items = resp.get('Items', [])
-        if not items:
-            logger.warning(f"No connection found for connectionId={connection_id}")
-            return {"statusCode": 404, "body": "Connection not found"}
-        org_id = items[0]['orgId']
-        table.delete_item(Key={'orgId': org_id, 'connectionId': connection_id})
-        logger.info(f"Deleted connection: orgId={org_id}, connectionId={connection_id}")
+        table.delete_item(Key=key)
+        logger.info(f"Deleted connection: orgId={key['orgId']}, connectionId={connection_id}")
         return {"statusCode": 200, "body": "Disconnected"}
     except Exception as e:
         logger.error(f"Error disconnecting connectionId={connection_id}: {e}")
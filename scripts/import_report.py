@@ -0,0 +1,120 @@
+"""
+Cold-start import report for the Lambda handlers.
+
+Imports each lambda/*/ handler module in a fresh interpreter with
+`python -X importtime` and prints its total import time plus the most
+expensive modules it pulls in, grouped by top-level package.
+
+    python scripts/import_report.py                 # all handlers
+    python scripts/import_report.py units login     # selected handlers
+    python scripts/import_report.py --budget-ms 400 # fail when over budget
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+LAMBDA_DIR = ROOT / "lambda"
+SRC_DIR = ROOT / "src"
+
+# Placeholders for settings some handlers read at import time
+IMPORT_ENV = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "WS_API_ENDPOINT": "https://example.invalid",
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def find_handlers() -> Dict[str, str]:
+    """Map each Lambda directory name to the module defining lambda_handler."""
+    handlers = {}
+    for directory in sorted(p for p in LAMBDA_DIR.iterdir() if p.is_dir()):
+        if (directory / "handler.py").exists():
+            handlers[directory.name] = "handler"
+            continue
+        for path in sorted(directory.glob("*.py")):
+            if "def lambda_handler" in path.read_text():
+                handlers[directory.name] = path.stem
+                break
+    return handlers
+
+
+def measure(name: str, module: str) -> Tuple[Optional[List[Tuple[int, int, str]]], str]:
+    """Return (depth, cumulative_us, module) rows, or None and the error output."""
+    env = {**IMPORT_ENV, **os.environ}
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(LAMBDA_DIR / name), str(SRC_DIR), env.get("PYTHONPATH")) if p)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=LAMBDA_DIR / name, env=env, capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            depth = (len(match.group(3)) - 1) // 2
+            rows.append((depth, int(match.group(2)), match.group(4)))
+    if proc.returncode != 0:
+        return None, proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed"
+    return rows, ""
+
+
+def summarize(rows: List[Tuple[int, int, str]], module: str) -> Tuple[int, Dict[str, int]]:
+    """Total import time and the cumulative cost of each package the handler imports."""
+    end = next((i for i, (depth, _, name) in enumerate(rows)
+                if depth == 0 and name == module), None)
+    if end is None:
+        return 0, {}
+    # -X importtime prints children before their parent, so the handler's
+    # subtree is the run of nested rows right above it
+    start = end
+    while start > 0 and rows[start - 1][0] > 0:
+        start -= 1
+    by_package: Dict[str, int] = defaultdict(int)
+    for depth, us, name in rows[start:end]:
+        # Direct imports of the handler module; EventCoord is broken down per module
+        if depth != 1:
+            continue
+        key = name if name.startswith("EventCoord.") else name.split(".")[0]
+        by_package[key] += us
+    return rows[end][1], by_package
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("handlers", nargs="*", help="Lambda directory names (default: all)")
+    parser.add_argument("--top", type=int, default=8, help="modules to list per handler")
+    parser.add_argument("--budget-ms", type=float, help="exit non-zero if a handler exceeds this")
+    args = parser.parse_args(argv)
+
+    handlers = find_handlers()
+    selected = args.handlers or list(handlers)
+    over_budget = []
+    for name in selected:
+        if name not in handlers:
+            print(f"{name}: no handler found", file=sys.stderr)
+            return 2
+        rows, error = measure(name, handlers[name])
+        if rows is None:
+            print(f"{name:<18} import failed: {error}")
+            over_budget.append(name)
+            continue
+        total, by_package = summarize(rows, handlers[name])
+        total_ms = total / 1000
+        flag = ""
+        if args.budget_ms is not None and total_ms > args.budget_ms:
+            flag = f"  OVER BUDGET ({args.budget_ms:.0f} ms)"
+            over_budget.append(name)
+        print(f"{name:<18} {total_ms:8.1f} ms{flag}")
+        for package, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"    {us / 1000:8.1f} ms  {package}")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
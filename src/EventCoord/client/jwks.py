@@ -0,0 +1,124 @@
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+import requests
+from authlib.jose import JsonWebKey
+from authlib.jose.rfc7517 import Key
+from EventCoord.utils.resources import ensure_tracing
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class JWKSCache:
+    """
+    Process-level cache of a JSON Web Key Set.
+
+    Keys are parsed once and indexed by `kid`. The refresh interval follows
+    the endpoint's `Cache-Control: max-age` (clamped to [min_ttl, max_ttl]).
+    Once expired, the current keys keep being served while a background
+    thread refetches them. A token signed with an unknown `kid` triggers an
+    immediate refetch, at most once per `unknown_kid_cooldown` seconds.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        default_ttl: float = 300,
+        min_ttl: float = 60,
+        max_ttl: float = 86400,
+        timeout: float = 5,
+        unknown_kid_cooldown: float = 30,
+    ):
+        self.url = url
+        self.default_ttl = default_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.timeout = timeout
+        self.unknown_kid_cooldown = unknown_kid_cooldown
+        self._keys: Dict[Optional[str], Key] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def _ttl_from_headers(self, headers: Mapping[str, str]) -> float:
+        match = _MAX_AGE.search(headers.get("Cache-Control", "") or "")
+        if not match:
+            return self.default_ttl
+        return max(self.min_ttl, min(self.max_ttl, int(match.group(1))))
+
+    def refresh(self) -> None:
+        logger.info(f"Fetching JWKS from {self.url}")
+        ensure_tracing()
+        resp = requests.get(self.url, timeout=self.timeout)
+        resp.raise_for_status()
+        keys: Dict[Optional[str], Key] = {}
+        for jwk in resp.json()["keys"]:
+            key = JsonWebKey.import_key(jwk)
+            keys[jwk.get("kid")] = key
+        now = time.monotonic()
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = now
+            self._expires_at = now + self._ttl_from_headers(resp.headers)
+        logger.debug(f"JWKS cached with kids: {list(keys)}")
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run() -> None:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Background JWKS refresh failed, serving stale keys: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def keys(self) -> Dict[Optional[str], Key]:
+        if not self._keys:
+            self.refresh()
+        elif time.monotonic() >= self._expires_at:
+            self._refresh_in_background()
+        return self._keys
+
+    def get_key(self, kid: Optional[str]) -> Key:
+        keys = self.keys()
+        if kid is None and len(keys) == 1:
+            return next(iter(keys.values()))
+        key = keys.get(kid)
+        if key is None and time.monotonic() - self._fetched_at >= self.unknown_kid_cooldown:
+            # Keys may have rotated before our cached copy expired
+            self.refresh()
+            key = self._keys.get(kid)
+        if key is None:
+            raise ValueError(f"No JWKS key found for kid {kid!r}")
+        return key
+
+    def load_key(self, header: Mapping[str, Any], payload: Any) -> Key:
+        """Key resolver suitable for authlib's JsonWebToken.decode."""
+        return self.get_key(header.get("kid"))
+
+
+_caches: Dict[str, JWKSCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_jwks_cache(url: str, **kwargs: Any) -> JWKSCache:
+    """Return the shared cache for `url`, creating it on first use."""
+    with _caches_lock:
+        cache = _caches.get(url)
+        if cache is None:
+            cache = _caches[url] = JWKSCache(url, **kwargs)
+        return cache
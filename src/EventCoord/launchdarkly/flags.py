@@ -1,15 +1,62 @@
 import os
-import ldclient
-from ldclient.context import Context
-from ldclient.config import Config
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional
 
-ldclient.set_config(Config(os.environ.get(
-    'LAUNCHDARKLY_SDK_KEY', '')))  # SDK key from env
-ld_client = ldclient.get()
+if TYPE_CHECKING:
+    from ldclient.client import LDClient
+    from ldclient.config import Config
+
+# The SDK is imported on first use; handlers that read entitlements from the
+# authorizer context never load it
+_ld_client: Optional["LDClient"] = None
+_ld_client_lock = threading.Lock()
+
+
+def _build_config() -> "Config":
+    from ldclient.config import Config
+    from ldclient.integrations import Files
+    flag_file = os.environ.get('LAUNCHDARKLY_FLAG_FILE')
+    if flag_file:
+        # Deterministic flags from a local JSON/YAML file, no network access
+        return Config(
+            os.environ.get('LAUNCHDARKLY_SDK_KEY') or 'offline',
+            update_processor_class=Files.new_data_source(paths=[flag_file]),
+            send_events=False,
+            diagnostic_opt_out=True,
+        )
+    return Config(os.environ.get('LAUNCHDARKLY_SDK_KEY', ''))  # SDK key from env
+
+
+def get_ld_client() -> "LDClient":
+    """
+    Start the LaunchDarkly client on first use instead of at import. The
+    client connects in the background; only the first caller in a container
+    waits for it, for at most LAUNCHDARKLY_START_WAIT seconds (default 1).
+    """
+    global _ld_client
+    with _ld_client_lock:
+        if _ld_client is None:
+            from ldclient.client import LDClient
+            _ld_client = LDClient(_build_config(), start_wait=0)
+            deadline = time.monotonic() + float(
+                os.environ.get('LAUNCHDARKLY_START_WAIT', '1'))
+            while not _ld_client.is_initialized() and time.monotonic() < deadline:
+                time.sleep(0.02)
+        return _ld_client
+
+
+# Access flags the authorizer evaluates once per token, keyed by the name
+# they are published under in requestContext.authorizer
+ENTITLEMENT_FLAGS = {
+    "admin-access": "admin_access",
+    "super-admin-access": "super_admin_access",
+}
 
 
 class Flags:
     def __init__(self, user):
+        from ldclient.context import Context
         user_ctx = (
             Context.builder(user.get("email") or user.get("sub"))
             .kind('user')
@@ -35,14 +82,62 @@ class Flags:
             .build()
         )
 
+    # Until the client has initialized these deny instead of blocking; after
+    # that the SDK serves its last-known flag data even if the stream drops
     def has_super_admin_access(self):
-        if not ld_client or not ld_client.is_initialized():
+        ld_client = get_ld_client()
+        if not ld_client.is_initialized():
             return False
 
         return ld_client.variation("super-admin-access", self.multi_ctx, False)
 
     def has_admin_access(self):
-        if not ld_client or not ld_client.is_initialized():
+        ld_client = get_ld_client()
+        if not ld_client.is_initialized():
             return False
 
         return ld_client.variation("admin-access", self.multi_ctx, False)
+
+    def entitlements(self) -> Dict[str, str]:
+        """
+        Evaluate the access flags with a single all_flags_state call, encoded
+        as strings for an authorizer context. Empty when LaunchDarkly is not
+        available so handlers fall back to evaluating the flags themselves.
+        """
+        ld_client = get_ld_client()
+        if not ld_client.is_initialized():
+            return {}
+        state = ld_client.all_flags_state(self.multi_ctx)
+        if not state.valid:
+            return {}
+        return {
+            name: "true" if state.get_flag_value(flag) is True else "false"
+            for flag, name in ENTITLEMENT_FLAGS.items()
+        }
+
+
+class AuthorizerFlags:
+    """Access flags already evaluated by the authorizer for this token."""
+
+    def __init__(self, authorizer: Mapping[str, Any]):
+        self.authorizer = authorizer
+
+    def _is_true(self, name: str) -> bool:
+        return str(self.authorizer.get(name)).lower() == "true"
+
+    def has_super_admin_access(self):
+        return self._is_true("super_admin_access")
+
+    def has_admin_access(self):
+        return self._is_true("admin_access")
+
+
+def get_flags(event: Mapping[str, Any], user: Mapping[str, Any]) -> "Flags | AuthorizerFlags":
+    """
+    Use the entitlements from requestContext.authorizer when the authorizer
+    supplied them, otherwise evaluate the flags for `user` at request time.
+    """
+    authorizer = (event.get("requestContext") or {}).get("authorizer") or {}
+    if all(name in authorizer for name in ENTITLEMENT_FLAGS.values()):
+        return AuthorizerFlags(authorizer)
+    return Flags(user)
@@ -1,12 +1,12 @@
-import os
 import uuid
-import boto3
 from boto3.dynamodb.conditions import Key
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator, Tuple, Iterable, Mapping
+from EventCoord.utils.batch import batch_get, batch_write
+from EventCoord.utils.pagination import iter_items, query_all, query_page
+from EventCoord.utils.resources import LazyTable
+from EventCoord.utils.update_expression import update_item, update_items
 
-dynamodb = boto3.resource("dynamodb")
-table: Any = dynamodb.Table(os.environ.get(  # type: ignore
-    'ACTIVITY_LOGS_TABLE', 'activity_logs'))
+table: Any = LazyTable('ACTIVITY_LOGS_TABLE', 'activity_logs')
 
 
 class ActivityLog:
@@ -19,26 +19,42 @@ class ActivityLog:
 
     @staticmethod
     def list(org_id: str) -> List[Dict[str, Any]]:
-        resp = table.query(KeyConditionExpression=Key("org_id").eq(org_id))
-        return resp.get("Items", [])
+        return query_all(table.query, KeyConditionExpression=Key("org_id").eq(org_id))
+
+    @staticmethod
+    def iter_list(org_id: str) -> Iterator[Dict[str, Any]]:
+        return iter_items(table.query, KeyConditionExpression=Key("org_id").eq(org_id))
+
+    @staticmethod
+    def list_page(
+        org_id: str,
+        limit: Optional[int] = None,
+        start_key: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        return query_page(
+            table.query,
+            limit,
+            start_key,
+            KeyConditionExpression=Key("org_id").eq(org_id)
+        )
 
     @staticmethod
     def list_by_volunteer(org_id: str, volunteer_id: str) -> List[Dict[str, Any]]:
-        resp = table.query(
+        return query_all(
+            table.query,
             IndexName="VolunteerIdIndex",
             KeyConditionExpression=Key("org_id").eq(
                 org_id) & Key("volunteerId").eq(volunteer_id)
         )
-        return resp.get("Items", [])
 
     @staticmethod
     def list_by_period(org_id: str, period_id: str) -> List[Dict[str, Any]]:
-        resp = table.query(
+        return query_all(
+            table.query,
             IndexName="PeriodIdIndex",
             KeyConditionExpression=Key("org_id").eq(
                 org_id) & Key("periodId").eq(period_id)
         )
-        return resp.get("Items", [])
 
     @staticmethod
     def create(org_id: str, item: Dict[str, Any]) -> Dict[str, Any]:
@@ -49,11 +65,49 @@ class ActivityLog:
         return item
 
     @staticmethod
-    def update(org_id: str, log_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
-        item = {"org_id": org_id, "logId": log_id, **updates}
-        table.put_item(Item=item)
-        return item
+    def update(
+        org_id: str,
+        log_id: str,
+        updates: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        return update_item(
+            table,
+            {"org_id": org_id, "logId": log_id},
+            updates,
+            expected_version
+        ) or {}
 
     @staticmethod
     def delete(org_id: str, log_id: str) -> None:
         table.delete_item(Key={"org_id": org_id, "logId": log_id})
+
+    @staticmethod
+    def get_many(org_id: str, log_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        return batch_get(
+            table, [{"org_id": org_id, "logId": log_id} for log_id in log_ids])
+
+    @staticmethod
+    def create_many(org_id: str, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        created = []
+        for item in items:
+            if "logId" not in item:
+                item["logId"] = str(uuid.uuid4())
+            item["org_id"] = org_id
+            created.append(item)
+        batch_write(table, puts=created)
+        return created
+
+    @staticmethod
+    def update_many(org_id: str, updates: Mapping[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return update_items(table, (
+            ({"org_id": org_id, "logId": log_id}, item_updates)
+            for log_id, item_updates in updates.items()
+        ))
+
+    @staticmethod
+    def delete_many(org_id: str, log_ids: Iterable[str]) -> None:
+        batch_write(
+            table,
+            delete_keys=[{"org_id": org_id, "logId": log_id} for log_id in log_ids]
+        )
@@ -1,15 +1,21 @@
-import os
 import uuid
-import boto3
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator, Tuple, Iterable, Mapping
 from boto3.dynamodb.conditions import Key
+from EventCoord.utils.batch import batch_get, batch_write
+from EventCoord.utils.pagination import iter_items, query_all, query_page
+from EventCoord.utils.resources import LazyTable
+from EventCoord.utils.update_expression import update_item, update_items
 
-dynamodb = boto3.resource("dynamodb")
-table: Any = dynamodb.Table(os.environ.get(  # type: ignore
-    'LOCATIONS_TABLE', 'locations'))
+table: Any = LazyTable('LOCATIONS_TABLE', 'locations')
 
 
 class Location:
+    # Leading columns of GET /locations/export, and all of them with ?columns=schema
+    CSV_FIELDS = (
+        "name",
+        "coordinates",
+    )
+
     @staticmethod
     def get(org_id: str, location_id: str) -> Optional[Dict[str, Any]]:
         resp = table.get_item(
@@ -18,8 +24,24 @@ class Location:
 
     @staticmethod
     def list(org_id: str) -> List[Dict[str, Any]]:
-        resp = table.query(KeyConditionExpression=Key("org_id").eq(org_id))
-        return resp.get("Items", [])
+        return query_all(table.query, KeyConditionExpression=Key("org_id").eq(org_id))
+
+    @staticmethod
+    def iter_list(org_id: str) -> Iterator[Dict[str, Any]]:
+        return iter_items(table.query, KeyConditionExpression=Key("org_id").eq(org_id))
+
+    @staticmethod
+    def list_page(
+        org_id: str,
+        limit: Optional[int] = None,
+        start_key: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        return query_page(
+            table.query,
+            limit,
+            start_key,
+            KeyConditionExpression=Key("org_id").eq(org_id)
+        )
 
     @staticmethod
     def create(org_id: str, item: Dict[str, Any]) -> Dict[str, Any]:
@@ -30,11 +52,49 @@ class Location:
         return item
 
     @staticmethod
-    def update(org_id: str, location_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
-        item = {"org_id": org_id, "locationId": location_id, **updates}
-        table.put_item(Item=item)
-        return item
+    def update(
+        org_id: str,
+        location_id: str,
+        updates: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        return update_item(
+            table,
+            {"org_id": org_id, "locationId": location_id},
+            updates,
+            expected_version
+        ) or {}
 
     @staticmethod
     def delete(org_id: str, location_id: str) -> None:
         table.delete_item(Key={"org_id": org_id, "locationId": location_id})
+
+    @staticmethod
+    def get_many(org_id: str, location_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        return batch_get(
+            table, [{"org_id": org_id, "locationId": location_id} for location_id in location_ids])
+
+    @staticmethod
+    def create_many(org_id: str, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        created = []
+        for item in items:
+            if "locationId" not in item:
+                item["locationId"] = str(uuid.uuid4())
+            item["org_id"] = org_id
+            created.append(item)
+        batch_write(table, puts=created)
+        return created
+
+    @staticmethod
+    def update_many(org_id: str, updates: Mapping[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return update_items(table, (
+            ({"org_id": org_id, "locationId": location_id}, item_updates)
+            for location_id, item_updates in updates.items()
+        ))
+
+    @staticmethod
+    def delete_many(org_id: str, location_ids: Iterable[str]) -> None:
+        batch_write(
+            table,
+            delete_keys=[{"org_id": org_id, "locationId": location_id} for location_id in location_ids]
+        )
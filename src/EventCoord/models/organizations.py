@@ -1,49 +1,228 @@
 import os
-import boto3
+import threading
+import time
 from boto3.dynamodb.conditions import Key
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, FrozenSet, Iterable, Iterator, List, Mapping, Tuple
 import uuid
+from EventCoord.utils.batch import batch_get, batch_write
+from EventCoord.utils.cache import TTLCache
+from EventCoord.utils.pagination import iter_items, query_all, query_page
+from EventCoord.utils.resources import LazyTable
+from EventCoord.utils.update_expression import update_item, update_items
 
-dynamodb = boto3.resource("dynamodb")
-table: Any = dynamodb.Table(os.environ.get(  # type: ignore
-    'ORGANIZATIONS_TABLE', 'organizations'))
+table: Any = LazyTable('ORGANIZATIONS_TABLE', 'organizations')
+
+# Organizations change rarely, so warm containers serve lookups from memory.
+# Only hits are cached; an unknown org_id/aud always goes to DynamoDB.
+ORG_CACHE_TTL = int(os.environ.get('ORG_CACHE_TTL', '300'))
+ORG_CACHE_SIZE = int(os.environ.get('ORG_CACHE_SIZE', '256'))
+_by_org_id: TTLCache[Dict[str, Any]] = TTLCache(ORG_CACHE_SIZE, ORG_CACHE_TTL)
+_by_aud: TTLCache[Dict[str, Any]] = TTLCache(ORG_CACHE_SIZE, ORG_CACHE_TTL)
+_invalidation_hooks: List[Callable[[Optional[str]], None]] = []
+
+AUD_INDEX_TTL = int(os.environ.get('AUD_INDEX_TTL', '300'))
+AUD_SCAN_SEGMENTS = int(os.environ.get('AUD_SCAN_SEGMENTS', '4'))
 
 
 class Organization:
     # TODO: Standardize function naming across models
     @staticmethod
     def get_by_org_id(org_id: str) -> Optional[Dict[str, Any]]:
+        cached = _by_org_id.get(org_id)
+        if cached is not None:
+            return dict(cached)
         resp = table.get_item(Key={"org_id": org_id})
-        return resp.get("Item")
+        item = resp.get("Item")
+        if item:
+            _by_org_id.set(org_id, item)
+        return dict(item) if item else None
 
     @staticmethod
     def get_by_aud(aud: str) -> Optional[Dict[str, Any]]:
+        cached = _by_aud.get(aud)
+        if cached is not None:
+            return dict(cached)
         resp = table.query(
             IndexName="aud-index",
             KeyConditionExpression=Key("aud").eq(aud)
         )
         items = resp.get("Items", [])
-        return items[0] if items else None
+        if not items:
+            return None
+        _by_aud.set(aud, items[0])
+        return dict(items[0])
+
+    @staticmethod
+    def invalidate_cache(org_id: Optional[str] = None) -> None:
+        """
+        Drop cached lookups for one organization, or everything when org_id
+        is None, and notify registered hooks. Called after every write.
+        """
+        if org_id is None:
+            _by_org_id.clear()
+            _by_aud.clear()
+        else:
+            _by_org_id.invalidate(org_id)
+            _by_aud.invalidate_where(lambda _, org: org.get("org_id") == org_id)
+        for hook in list(_invalidation_hooks):
+            hook(org_id)
+
+    @staticmethod
+    def on_invalidate(hook: Callable[[Optional[str]], None]) -> None:
+        _invalidation_hooks.append(hook)
 
     @staticmethod
     def list_all() -> list[dict[str, Any]]:
-        resp = table.scan()
-        return resp.get("Items", [])
+        return query_all(table.scan)
+
+    @staticmethod
+    def iter_all() -> Iterator[Dict[str, Any]]:
+        return iter_items(table.scan)
+
+    @staticmethod
+    def list_auds(segments: int = AUD_SCAN_SEGMENTS) -> List[str]:
+        """
+        Return every organization audience using a parallel, paginated scan
+        that only projects the aud attribute.
+        """
+        # Segments scan through the low-level client, which unlike the
+        # shared Table resource is safe to use from several threads
+        client = table.meta.client
+        table_name = table.name
+
+        def scan_segment(segment: int) -> List[str]:
+            return [
+                item["aud"]["S"]
+                for item in iter_items(
+                    client.scan,
+                    TableName=table_name,
+                    ProjectionExpression="#aud",
+                    ExpressionAttributeNames={"#aud": "aud"},
+                    Segment=segment,
+                    TotalSegments=segments,
+                )
+                if item.get("aud", {}).get("S")
+            ]
+
+        with ThreadPoolExecutor(max_workers=segments) as pool:
+            return [aud for auds in pool.map(scan_segment, range(segments)) for aud in auds]
+
+    @staticmethod
+    def list_page(
+        limit: Optional[int] = None,
+        start_key: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        return query_page(table.scan, limit, start_key)
 
     @staticmethod
     def create(aud: str, name: str) -> Dict[str, Any]:
         org_id = str(uuid.uuid4())
         item = {"org_id": org_id, "aud": aud, "name": name}
         table.put_item(Item=item)
+        Organization.invalidate_cache(org_id)
         return item
 
     @staticmethod
-    def update(org_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        item = {"org_id": org_id, **updates}
-        table.put_item(Item=item)
-        return item
+    def update(
+        org_id: str,
+        updates: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            return update_item(
+                table,
+                {"org_id": org_id},
+                updates,
+                expected_version,
+                require_exists=True
+            )
+        finally:
+            Organization.invalidate_cache(org_id)
 
     @staticmethod
     def delete(org_id: str) -> bool:
         table.delete_item(Key={"org_id": org_id})
+        Organization.invalidate_cache(org_id)
         return True
+
+    @staticmethod
+    def get_many(org_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        return batch_get(table, [{"org_id": org_id} for org_id in org_ids])
+
+    @staticmethod
+    def create_many(orgs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        items = [
+            {"org_id": str(uuid.uuid4()), "aud": org["aud"], "name": org["name"]}
+            for org in orgs
+        ]
+        batch_write(table, puts=items)
+        for item in items:
+            Organization.invalidate_cache(item["org_id"])
+        return items
+
+    @staticmethod
+    def update_many(updates: Mapping[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        items = update_items(table, (
+            ({"org_id": org_id}, org_updates)
+            for org_id, org_updates in updates.items()
+        ))
+        for item in items:
+            Organization.invalidate_cache(item["org_id"])
+        return items
+
+    @staticmethod
+    def delete_many(org_ids: Iterable[str]) -> None:
+        org_ids = list(org_ids)
+        batch_write(table, delete_keys=[{"org_id": org_id} for org_id in org_ids])
+        for org_id in org_ids:
+            Organization.invalidate_cache(org_id)
+
+
+class AudienceIndex:
+    """
+    Set of audiences (OAuth client IDs) that belong to a known organization.
+    Loaded lazily on first use, reloaded after AUD_INDEX_TTL seconds or when
+    an organization changes in this container, and filled in incrementally
+    when an unknown audience turns out to exist in the aud-index GSI.
+    """
+
+    def __init__(self, ttl: float = AUD_INDEX_TTL, segments: int = AUD_SCAN_SEGMENTS):
+        self.ttl = ttl
+        self.segments = segments
+        self._auds: Optional[FrozenSet[str]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        # Recently rejected audiences, so a bad token cannot force a GSI query per attempt
+        self._misses: TTLCache[bool] = TTLCache(1024, 60)
+        Organization.on_invalidate(lambda org_id: self.invalidate())
+
+    def auds(self) -> FrozenSet[str]:
+        auds = self._auds
+        if auds is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return auds
+        with self._lock:
+            if self._auds is None or time.monotonic() - self._loaded_at >= self.ttl:
+                self._auds = frozenset(Organization.list_auds(self.segments))
+                self._loaded_at = time.monotonic()
+                self._misses.clear()
+            return self._auds
+
+    def __contains__(self, aud: object) -> bool:
+        if not isinstance(aud, str) or not aud:
+            return False
+        if aud in self.auds():
+            return True
+        if self._misses.get(aud):
+            return False
+        if Organization.get_by_aud(aud):
+            with self._lock:
+                self._auds = (self._auds or frozenset()) | {aud}
+            return True
+        self._misses.set(aud, True)
+        return False
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._auds = None
+            self._misses.clear()
@@ -0,0 +1,98 @@
+import random
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, TypeVar
+
+BATCH_WRITE_LIMIT = 25
+BATCH_GET_LIMIT = 100
+MAX_ATTEMPTS = 8
+BASE_DELAY = 0.05
+MAX_DELAY = 2.0
+
+T = TypeVar("T")
+
+
+class BatchIncompleteError(Exception):
+    """Raised when DynamoDB keeps returning unprocessed items after all retries."""
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    chunk: List[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _backoff(attempt: int) -> None:
+    # Full jitter keeps concurrent importers from retrying in lockstep
+    time.sleep(random.uniform(0, min(MAX_DELAY, BASE_DELAY * (2 ** attempt))))
+
+
+def _write_chunk(client: Any, table_name: str, requests: List[Dict[str, Any]]) -> None:
+    pending: Dict[str, Any] = {table_name: requests}
+    for attempt in range(MAX_ATTEMPTS):
+        resp = client.batch_write_item(RequestItems=pending)
+        pending = resp.get("UnprocessedItems") or {}
+        if not pending:
+            return
+        _backoff(attempt)
+    raise BatchIncompleteError(
+        f"{len(pending.get(table_name, []))} writes to {table_name} unprocessed after {MAX_ATTEMPTS} attempts")
+
+
+def batch_write(
+    table: Any,
+    puts: Iterable[Dict[str, Any]] = (),
+    delete_keys: Iterable[Dict[str, Any]] = (),
+) -> int:
+    """
+    Write items and delete keys using BatchWriteItem in chunks of 25,
+    retrying UnprocessedItems with exponential backoff. Returns the number of
+    requests written.
+    """
+    requests: List[Dict[str, Any]] = [
+        {"PutRequest": {"Item": item}} for item in puts]
+    requests.extend({"DeleteRequest": {"Key": key}} for key in delete_keys)
+    client = table.meta.client
+    for chunk in chunked(requests, BATCH_WRITE_LIMIT):
+        _write_chunk(client, table.name, chunk)
+    return len(requests)
+
+
+def batch_get(table: Any, keys: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Fetch items by primary key using BatchGetItem in chunks of 100, retrying
+    UnprocessedKeys with exponential backoff. Missing keys are omitted and the
+    result order is not guaranteed.
+    """
+    client = table.meta.client
+    items: List[Dict[str, Any]] = []
+    for chunk in chunked(_unique_keys(keys), BATCH_GET_LIMIT):
+        pending: Dict[str, Any] = {table.name: {"Keys": chunk}}
+        for attempt in range(MAX_ATTEMPTS):
+            resp = client.batch_get_item(RequestItems=pending)
+            items.extend(resp.get("Responses", {}).get(table.name, []))
+            pending = resp.get("UnprocessedKeys") or {}
+            if not pending:
+                break
+            _backoff(attempt)
+        else:
+            raise BatchIncompleteError(
+                f"{len(pending[table.name]['Keys'])} keys from {table.name} unprocessed after {MAX_ATTEMPTS} attempts")
+    return items
+
+
+def _unique_keys(keys: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # BatchGetItem rejects requests that contain the same key twice
+    seen = set()
+    unique: List[Dict[str, Any]] = []
+    for key in keys:
+        marker = tuple(sorted(key.items()))
+        if marker in seen:
+            continue
+        seen.add(marker)
+        unique.append(key)
+    return unique
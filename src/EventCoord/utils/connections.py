@@ -0,0 +1,64 @@
+import os
+import time
+from typing import Any, Dict, Mapping, Optional
+
+# Seconds a WebSocket connection stays registered after it was last seen.
+# API Gateway closes connections idle for 10 minutes, so clients ping more
+# often than that; expired items are skipped by fan-out and removed by the
+# table's DynamoDB TTL on `expiresAt`
+CONNECTION_TTL = int(os.environ.get("WS_CONNECTION_TTL", "900"))
+
+
+def connection_item(
+    connection_id: str,
+    org_id: str,
+    user_id: str,
+    now: Optional[int] = None,
+) -> Dict[str, Any]:
+    now = int(time.time()) if now is None else now
+    return {
+        "connectionId": connection_id,
+        "orgId": org_id,
+        "user": user_id,
+        # `subscriptions` stays unset, meaning every topic, until the first subscribe
+        "lastSeen": now,
+        "expiresAt": now + CONNECTION_TTL,
+    }
+
+
+def touch_values(now: Optional[int] = None) -> Dict[str, int]:
+    """ExpressionAttributeValues for `SET lastSeen = :seen, expiresAt = :expires`."""
+    now = int(time.time()) if now is None else now
+    return {":seen": now, ":expires": now + CONNECTION_TTL}
+
+
+def is_expired(conn: Mapping[str, Any], now: Optional[float] = None) -> bool:
+    """DynamoDB TTL deletes lazily, so readers must skip expired items themselves."""
+    expires_at = conn.get("expiresAt")
+    if expires_at is None:
+        return False
+    return int(expires_at) <= (time.time() if now is None else now)
+
+
+def needs_touch(conn: Mapping[str, Any], now: Optional[float] = None) -> bool:
+    """
+    True once less than half of CONNECTION_TTL is left, so a connection
+    receiving many pushes is refreshed at most every TTL / 2.
+    """
+    expires_at = conn.get("expiresAt")
+    if expires_at is None:
+        return True
+    return int(expires_at) - (time.time() if now is None else now) < CONNECTION_TTL / 2
+
+
+def connection_key(event: Mapping[str, Any]) -> Optional[Dict[str, str]]:
+    """
+    Table key of the event's connection. The $connect authorizer context,
+    and with it org_id, is passed to every route of the connection.
+    """
+    request_context = event.get("requestContext", {})
+    connection_id = request_context.get("connectionId")
+    org_id = (request_context.get("authorizer") or {}).get("org_id")
+    if not connection_id or not org_id:
+        return None
+    return {"orgId": org_id, "connectionId": connection_id}
@@ -1,31 +1,69 @@
 import csv
 import io
 import json
-from typing import Any, Iterable, Mapping, Sequence
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Optional, Sequence
 
 
-def _normalize_csv_value(value: Any) -> str:
+def normalize_csv_value(value: Any) -> str:
     if value is None:
         return ""
     if isinstance(value, (dict, list)):
-        return json.dumps(value, separators=(",", ":"), ensure_ascii=True)
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=True, default=str)
     return str(value)
 
 
-def items_to_csv(
-    items: Sequence[Mapping[str, Any]],
+def discover_fieldnames(
+    items: Iterable[Mapping[str, Any]],
     exclude_fields: Iterable[str],
-) -> str:
+    preferred: Sequence[str] = (),
+) -> List[str]:
+    """
+    Every attribute found in `items` except `exclude_fields`: those listed in
+    `preferred` first and in that order, then the rest sorted.
+    """
     exclude = set(exclude_fields)
-    if not items:
-        return ""
-    fieldnames = sorted(
-        {key for item in items for key in item.keys() if key not in exclude}
-    )
-    output = io.StringIO()
-    writer = csv.writer(output)
+    fieldnames = set()
+    for item in items:
+        fieldnames.update(key for key in item.keys() if key not in exclude)
+    known = [name for name in preferred if name in fieldnames]
+    return known + sorted(fieldnames.difference(known))
+
+
+def iter_csv(
+    items: Iterable[Mapping[str, Any]],
+    fieldnames: Sequence[str],
+) -> Iterator[str]:
+    """Yield the header and then one CSV line per item as it is consumed."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
     writer.writerow(fieldnames)
+    yield buffer.getvalue()
     for item in items:
-        row = [_normalize_csv_value(item.get(name)) for name in fieldnames]
-        writer.writerow(row)
-    return output.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow([normalize_csv_value(item.get(name)) for name in fieldnames])
+        yield buffer.getvalue()
+
+
+def export_csv(
+    item_source: Callable[[], Iterable[Mapping[str, Any]]],
+    exclude_fields: Iterable[str],
+    fieldnames: Optional[Sequence[str]] = None,
+    preferred: Sequence[str] = (),
+) -> Iterator[str]:
+    """
+    Stream items from `item_source` (typically a model's paginated iter_list)
+    as CSV. With explicit `fieldnames` rows are written in a single pass.
+    Without them every attribute is exported, `preferred` columns first: a
+    first pass over the source only collects column names and a second pass
+    writes the rows, so memory stays bounded by a page rather than the whole
+    table.
+    """
+    exclude = set(exclude_fields)
+    if fieldnames is None:
+        fieldnames = discover_fieldnames(item_source(), exclude, preferred)
+        if not fieldnames:
+            return
+    else:
+        fieldnames = [name for name in fieldnames if name not in exclude]
+    yield from iter_csv(item_source(), fieldnames)
@@ -1,6 +1,13 @@
 import csv
 import io
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from EventCoord.utils.csv_export import normalize_csv_value
+from EventCoord.utils.update_expression import VERSION_ATTRIBUTE, VersionConflictError
+
+# Bookkeeping attributes that CSV rows may carry but must never be written back
+IMPORT_IGNORED_FIELDS = ('org_id', 'version')
 
 
 def parse_csv_rows(csv_text: str) -> List[Dict[str, Any]]:
@@ -41,3 +48,122 @@ def build_natural_key(row: Dict[str, Any], fields: Iterable[str]) -> Optional[Tu
 
 def prune_empty_fields(row: Dict[str, Any]) -> Dict[str, Any]:
     return {key: value for key, value in row.items() if value not in ("", None)}
+
+
+def diff_fields(existing: Mapping[str, Any], updates: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Return the subset of `updates` whose values differ from `existing`,
+    comparing in CSV form so stored numbers and JSON values match their
+    exported text.
+    """
+    return {
+        key: value
+        for key, value in updates.items()
+        if normalize_csv_value(existing.get(key)) != normalize_csv_value(value)
+    }
+
+
+@dataclass
+class ImportPlan:
+    creates: List[Dict[str, Any]] = field(default_factory=list)
+    # Changed attributes per item id, the stored version they were diffed
+    # against and the CSV rows behind them
+    updates: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    versions: Dict[str, int] = field(default_factory=dict)
+    update_rows: Dict[str, List[int]] = field(default_factory=dict)
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    conflicts: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'unchanged': self.unchanged,
+            'skipped': self.skipped,
+            'conflicts': self.conflicts,
+            'errors': self.errors,
+        }
+
+
+def plan_import(
+    rows: Iterable[Dict[str, Any]],
+    existing_items: Iterable[Dict[str, Any]],
+    key_fields: Sequence[str],
+    id_field: str,
+    missing_key_error: str,
+    validate_create: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+) -> ImportPlan:
+    """
+    Match CSV rows to existing items by natural key and work out the minimal
+    set of writes: new rows become creates, matched rows become updates only
+    when at least one non-empty value differs from what is stored.
+    """
+    existing_map: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+    for item in existing_items:
+        key = build_natural_key(item, key_fields)
+        if key:
+            existing_map[key] = item
+    plan = ImportPlan()
+    for index, row in enumerate(rows, start=2):
+        for ignored in IMPORT_IGNORED_FIELDS + (id_field,):
+            row.pop(ignored, None)
+        key = build_natural_key(row, key_fields)
+        if not key:
+            plan.skipped += 1
+            plan.errors.append({'row': index, 'error': missing_key_error})
+            continue
+        existing_item = existing_map.get(key)
+        if existing_item is None:
+            error = validate_create(row) if validate_create else None
+            if error:
+                plan.skipped += 1
+                plan.errors.append({'row': index, 'error': error})
+                continue
+            plan.creates.append(row)
+            plan.created += 1
+            existing_map[key] = row
+            continue
+        updates = prune_empty_fields(row)
+        if not updates:
+            plan.skipped += 1
+            continue
+        item_id = existing_item.get(id_field)
+        # Compare against any update already queued for this item in this file
+        current = {**existing_item, **plan.updates.get(item_id, {})} if item_id else existing_item
+        changes = diff_fields(current, updates)
+        if not changes:
+            plan.unchanged += 1
+            continue
+        plan.updated += 1
+        if not item_id:
+            # Repeat of a row already queued for creation
+            existing_item.update(changes)
+            continue
+        plan.updates[item_id] = {**plan.updates.get(item_id, {}), **changes}
+        plan.versions[item_id] = int(existing_item.get(VERSION_ATTRIBUTE) or 0)
+        plan.update_rows.setdefault(item_id, []).append(index)
+    return plan
+
+
+def apply_updates(
+    plan: ImportPlan,
+    update: Callable[[str, Dict[str, Any], int], Any],
+) -> None:
+    """
+    Write the planned updates with `update(item_id, changes, expected_version)`,
+    typically a model's update. Items changed since they were read for
+    planning are not overwritten; their rows are counted as conflicts.
+    """
+    for item_id, changes in plan.updates.items():
+        try:
+            update(item_id, changes, plan.versions[item_id])
+        except VersionConflictError:
+            rows = plan.update_rows.get(item_id, [])
+            plan.updated -= len(rows)
+            plan.conflicts += len(rows)
+            plan.errors.extend(
+                {'row': row, 'error': 'Item changed during import'} for row in rows)
@@ -1,9 +1,8 @@
 import logging
 import os
-from typing import Any, Dict, Mapping
-
-from aws_xray_sdk.core import patch_all, xray_recorder
+from typing import Any, Dict, Mapping, Tuple
 
+from EventCoord.utils.resources import enable_tracing
 from EventCoord.utils.response import decode_claims
 from EventCoord.utils.types import APIGatewayProxyEvent
 
@@ -11,13 +10,14 @@ CORS_HEADERS = {
     "Access-Control-Allow-Origin": "*",
     "Access-Control-Allow-Headers": "Content-Type,Authorization",
     "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
-    "Access-Control-Expose-Headers": "Content-Disposition",
+    "Access-Control-Expose-Headers": "Content-Disposition,X-Next-Token",
 }
 
 
 def init_tracing(service_name: str = "incident-cmd") -> None:
-    patch_all()  # Automatically patches boto3, requests, etc.
-    xray_recorder.configure(service=service_name)
+    # X-Ray is imported and patched when the first AWS client or JWKS
+    # fetch needs it, not while the handler module is imported
+    enable_tracing(service_name)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -35,7 +35,18 @@ def get_logger(name: str) -> logging.Logger:
     return logger
 
 
-def get_claims(event: APIGatewayProxyEvent | Mapping[str, Any]) -> Dict[str, Any]:
+# Claims the authorizer copies into requestContext.authorizer
+AUTHORIZER_CLAIMS = ("sub", "email", "name", "hd", "org_id", "org_name")
+
+# Claims for the most recent event, so repeated calls within one request are free
+_last_claims: Tuple[Any, Dict[str, Any]] = (None, {})
+
+
+def _decode_claims(event: APIGatewayProxyEvent | Mapping[str, Any]) -> Dict[str, Any]:
+    authorizer = (event.get("requestContext") or {}).get("authorizer") or {}
+    if authorizer.get("sub") or authorizer.get("org_id"):
+        # Already validated by the authorizer, no need to decode the token
+        return {k: authorizer[k] for k in AUTHORIZER_CLAIMS if authorizer.get(k) is not None}
     claims = decode_claims(event)
     if claims is None:
         return {}
@@ -45,3 +56,16 @@ def get_claims(event: APIGatewayProxyEvent | Mapping[str, Any]) -> Dict[str, Any
         return dict(claims)
     except Exception:
         return {}
+
+
+def get_claims(event: APIGatewayProxyEvent | Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Return the caller's claims, preferring requestContext.authorizer and only
+    decoding the bearer token when the authorizer did not supply them.
+    """
+    global _last_claims
+    last_event, claims = _last_claims
+    if last_event is not event:
+        claims = _decode_claims(event)
+        _last_claims = (event, claims)
+    return claims
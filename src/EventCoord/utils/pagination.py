@@ -0,0 +1,103 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+NEXT_TOKEN_HEADER = "X-Next-Token"
+
+
+def iter_pages(operation: Callable[..., Dict[str, Any]], **kwargs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Call a DynamoDB query/scan operation repeatedly, following
+    LastEvaluatedKey, and yield each raw response page on demand.
+    """
+    while True:
+        resp = operation(**kwargs)
+        yield resp
+        last_key = resp.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def iter_items(operation: Callable[..., Dict[str, Any]], **kwargs: Any) -> Iterator[Dict[str, Any]]:
+    for page in iter_pages(operation, **kwargs):
+        yield from page.get("Items", [])
+
+
+def query_all(operation: Callable[..., Dict[str, Any]], **kwargs: Any) -> List[Dict[str, Any]]:
+    return list(iter_items(operation, **kwargs))
+
+
+def query_page(
+    operation: Callable[..., Dict[str, Any]],
+    limit: Optional[int] = None,
+    start_key: Optional[Dict[str, Any]] = None,
+    **kwargs: Any,
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Fetch a single page of at most `limit` items starting after `start_key`.
+    Returns the items and the key to resume from (None when exhausted).
+    """
+    kwargs["Limit"] = limit or DEFAULT_PAGE_LIMIT
+    if start_key:
+        kwargs["ExclusiveStartKey"] = start_key
+    resp = operation(**kwargs)
+    return resp.get("Items", []), resp.get("LastEvaluatedKey")
+
+
+def encode_next_token(last_key: Optional[Mapping[str, Any]]) -> Optional[str]:
+    if not last_key:
+        return None
+    raw = json.dumps(last_key, separators=(",", ":"), sort_keys=True, default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_next_token(token: str) -> Dict[str, Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError("Invalid nextToken") from e
+    if not isinstance(key, dict) or not all(isinstance(v, str) for v in key.values()):
+        raise ValueError("Invalid nextToken")
+    return key
+
+
+def get_page_params(
+    event: Mapping[str, Any],
+    org_id: Optional[str] = None,
+) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+    """
+    Read `limit` and `nextToken` from the query string. Both are None when the
+    caller did not ask for pagination. Raises ValueError on bad input,
+    including a token minted for a different organization.
+    """
+    params = event.get("queryStringParameters") or {}
+    raw_limit = params.get("limit")
+    raw_token = params.get("nextToken")
+    limit = None
+    start_key = None
+    if raw_limit not in (None, ""):
+        try:
+            limit = int(raw_limit)
+        except (TypeError, ValueError) as e:
+            raise ValueError("limit must be an integer") from e
+        if limit < 1 or limit > MAX_PAGE_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_LIMIT}")
+    if raw_token:
+        start_key = decode_next_token(raw_token)
+        if org_id is not None and start_key.get("org_id") != org_id:
+            raise ValueError("Invalid nextToken")
+    if raw_token and limit is None:
+        limit = DEFAULT_PAGE_LIMIT
+    return limit, start_key
+
+
+def page_headers(headers: Mapping[str, str], last_key: Optional[Mapping[str, Any]]) -> Dict[str, str]:
+    token = encode_next_token(last_key)
+    if not token:
+        return dict(headers)
+    return {**headers, NEXT_TOKEN_HEADER: token}
@@ -0,0 +1,121 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Shared, per-container registry of expensive objects (boto3 resources,
+# tables, clients) created on first use instead of at import time
+_registry: Dict[Hashable, Any] = {}
+_registry_lock = threading.RLock()
+
+_tracing_service: Optional[str] = None
+_tracing_applied = False
+
+
+def enable_tracing(service_name: str = "incident-cmd") -> None:
+    """Request X-Ray tracing; patching is applied before the first AWS call."""
+    global _tracing_service
+    _tracing_service = service_name
+
+
+def ensure_tracing() -> None:
+    global _tracing_applied
+    if _tracing_applied or _tracing_service is None:
+        return
+    with _registry_lock:
+        if _tracing_applied:
+            return
+        from aws_xray_sdk.core import patch_all, xray_recorder
+        patch_all()  # Automatically patches boto3, requests, etc.
+        xray_recorder.configure(service=_tracing_service)
+        _tracing_applied = True
+
+
+def lazy_resource(key: Hashable, factory: Callable[[], Any]) -> Any:
+    """Return the object registered under `key`, creating it with `factory` once."""
+    value = _registry.get(key)
+    if value is not None:
+        return value
+    with _registry_lock:
+        value = _registry.get(key)
+        if value is None:
+            ensure_tracing()
+            value = _registry[key] = factory()
+        return value
+
+
+def reset_resources() -> None:
+    with _registry_lock:
+        _registry.clear()
+
+
+def client_config() -> Any:
+    """
+    botocore settings shared by every client: TCP keep-alive, a connection
+    pool sized for concurrent fan-out (AWS_MAX_POOL_CONNECTIONS, default 50)
+    and adaptive retries (AWS_MAX_ATTEMPTS, default 5).
+    """
+    from botocore.config import Config
+    return Config(
+        tcp_keepalive=True,
+        max_pool_connections=int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50")),
+        retries={
+            "mode": "adaptive",
+            "max_attempts": int(os.environ.get("AWS_MAX_ATTEMPTS", "5")),
+        },
+    )
+
+
+def get_client(
+    service: str,
+    endpoint_url: Optional[str] = None,
+    region_name: Optional[str] = None,
+    **config: Any,
+) -> Any:
+    """
+    Return the shared boto3 client for (service, endpoint_url, region_name).
+    Extra keyword arguments override botocore Config options (e.g.
+    read_timeout) and get a client of their own.
+    """
+    def create() -> Any:
+        import boto3
+        from botocore.config import Config
+        merged = client_config()
+        if config:
+            merged = merged.merge(Config(**config))
+        return boto3.client(
+            service, endpoint_url=endpoint_url, region_name=region_name,
+            config=merged)
+    # Config values may be dicts (e.g. retries), so key on their repr
+    key = ("client", service, endpoint_url, region_name,
+           tuple(sorted((k, repr(v)) for k, v in config.items())))
+    return lazy_resource(key, create)
+
+
+def get_resource(service: str, region_name: Optional[str] = None) -> Any:
+    def create() -> Any:
+        import boto3
+        return boto3.resource(
+            service, region_name=region_name, config=client_config())
+    return lazy_resource(("resource", service, region_name), create)
+
+
+def dynamodb_resource() -> Any:
+    return get_resource("dynamodb")
+
+
+class LazyTable:
+    """
+    Stand-in for a boto3 DynamoDB Table that is only created when one of its
+    attributes is first used. The table name is read from `env_var`.
+    """
+
+    def __init__(self, env_var: str, default: str):
+        self.table_name = os.environ.get(env_var, default)
+
+    def resolve(self) -> Any:
+        return lazy_resource(
+            ("table", self.table_name),
+            lambda: dynamodb_resource().Table(self.table_name))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
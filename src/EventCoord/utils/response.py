@@ -1,9 +1,19 @@
 import json
-from authlib.jose import JWTClaims
-from jose import jwt
+from decimal import Decimal
 from EventCoord.utils.types import APIGatewayProxyResponse
 from EventCoord.utils.types import APIGatewayProxyEvent
-from typing import Dict, Any, Optional, Mapping, cast
+from typing import TYPE_CHECKING, Dict, Any, Optional, Mapping, cast
+
+if TYPE_CHECKING:
+    from authlib.jose import JWTClaims
+
+
+def _json_default(value: Any) -> Any:
+    # DynamoDB returns all numbers (e.g. item versions) as Decimal
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
 
 def build_response(
     status_code: int,
@@ -12,7 +22,7 @@ def build_response(
     is_base64_encoded: bool = False,
 ) -> APIGatewayProxyResponse:
     if isinstance(body, (dict, list)):
-        response_body = json.dumps(body)
+        response_body = json.dumps(body, default=_json_default)
     elif isinstance(body, str):
         response_body = body
     else:
@@ -28,7 +38,7 @@ def build_response(
 
 def decode_claims(
     event: Mapping[str, Any] | APIGatewayProxyEvent
-) -> Optional[JWTClaims | Dict[str, Any]]:
+) -> Optional["JWTClaims | Dict[str, Any]"]:
     """
     Decode API Gateway Proxy Event to collect JWT and return claims
     """
@@ -39,7 +49,8 @@ def decode_claims(
         if token and token.startswith('Bearer '):
             token = token.replace("Bearer ", "").strip()
     if token:
-        # Use empty string as key for unsigned JWTs and pass claims_cls and claims_options
+        # Imported here so handlers that read the authorizer context never load jose
+        from jose import jwt
         payload = jwt.get_unverified_claims(token)
         return payload
     return None
@@ -0,0 +1,85 @@
+import json
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from boto3.dynamodb.types import TypeDeserializer
+
+_deserializer = TypeDeserializer()
+
+
+def json_default(value: Any) -> Any:
+    # Deserialized stream images hold Decimal numbers and Python sets
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", errors="replace")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_message(message: Mapping[str, Any]) -> bytes:
+    return json.dumps(message, default=json_default, separators=(",", ":")).encode("utf-8")
+
+
+class StreamImage(Mapping[str, Any]):
+    """
+    Read-only view of a DynamoDB stream image (NewImage, OldImage or Keys)
+    that deserializes each attribute on first access and caches the result.
+    Use to_dict() when every attribute is needed.
+    """
+
+    def __init__(self, image: Optional[Mapping[str, Any]]):
+        self._raw = image or {}
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            value = self._values[key] = _deserializer.deserialize(self._raw[key])
+            return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._raw
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def raw(self, key: str) -> Any:
+        """The attribute in DynamoDB JSON form, e.g. {"S": "abc"}."""
+        return self._raw[key]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: self[k] for k in self._raw}
+
+
+def _same_value(old: Mapping[str, Any], new: Mapping[str, Any], key: str) -> bool:
+    # Identical wire values are equal without deserializing either side
+    if isinstance(old, StreamImage) and isinstance(new, StreamImage) and old.raw(key) == new.raw(key):
+        return True
+    return old[key] == new[key]
+
+
+def image_diff(
+    old: Optional[Mapping[str, Any]],
+    new: Optional[Mapping[str, Any]],
+    ignore: Iterable[str] = (),
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Compare two item images and return (changed attributes with their new
+    values, names of removed attributes), skipping attributes in `ignore`.
+    StreamImage inputs only deserialize attributes whose wire values differ.
+    """
+    old = old or {}
+    new = new or {}
+    skip = set(ignore)
+    changed = {
+        k: new[k] for k in new
+        if k not in skip and (k not in old or not _same_value(old, new, k))
+    }
+    removed = [k for k in old if k not in skip and k not in new]
+    return changed, removed
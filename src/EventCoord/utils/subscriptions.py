@@ -0,0 +1,75 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+# Entity types a WebSocket connection can subscribe to, and the attributes
+# a subscription may narrow them by
+TOPIC_SCOPES: Dict[str, tuple] = {
+    "volunteers": ("periodId",),
+    "assignments": ("periodId",),
+    "periods": ("incidentId",),
+    "units": (),
+    "incidents": (),
+    "locations": (),
+    "radios": (),
+}
+
+
+def normalize_topic(raw: Any) -> Dict[str, str]:
+    """
+    Validate a client-supplied topic such as {"entity": "volunteers",
+    "periodId": "p1"} and return it with only the supported keys.
+    Raises ValueError for unknown entities or scopes.
+    """
+    if isinstance(raw, str):
+        raw = {"entity": raw}
+    if not isinstance(raw, Mapping):
+        raise ValueError("Topic must be an entity name or an object")
+    entity = raw.get("entity")
+    if entity not in TOPIC_SCOPES:
+        raise ValueError(f"Unknown entity: {entity}")
+    topic = {"entity": entity}
+    for field, value in raw.items():
+        if field == "entity":
+            continue
+        if field not in TOPIC_SCOPES[entity]:
+            raise ValueError(f"{entity} cannot be scoped by {field}")
+        if not isinstance(value, str) or not value:
+            raise ValueError(f"{field} must be a non-empty string")
+        topic[field] = value
+    return topic
+
+
+def merge_topics(current: Iterable[Mapping[str, str]], topics: Iterable[Mapping[str, str]]) -> List[Dict[str, str]]:
+    merged = [dict(t) for t in current]
+    for topic in topics:
+        if dict(topic) not in merged:
+            merged.append(dict(topic))
+    return merged
+
+
+def remove_topics(current: Iterable[Mapping[str, str]], topics: Iterable[Mapping[str, str]]) -> List[Dict[str, str]]:
+    removed = [dict(t) for t in topics]
+    return [dict(t) for t in current if dict(t) not in removed]
+
+
+def topic_matches(topic: Mapping[str, str], entity: str, scope: Mapping[str, Optional[str]]) -> bool:
+    if topic.get("entity") != entity:
+        return False
+    for field, value in topic.items():
+        # A change that does not carry the scoped attribute still goes out
+        if field != "entity" and scope.get(field) is not None and scope[field] != value:
+            return False
+    return True
+
+
+def is_subscribed(
+    subscriptions: Optional[Iterable[Mapping[str, str]]],
+    entity: str,
+    scope: Mapping[str, Optional[str]],
+) -> bool:
+    """
+    Connections that never subscribed (subscriptions None) receive every
+    change for their org; once subscribed, even to nothing, only matches.
+    """
+    if subscriptions is None:
+        return True
+    return any(topic_matches(topic, entity, scope) for topic in subscriptions)
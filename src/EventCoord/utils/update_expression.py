@@ -0,0 +1,130 @@
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+VERSION_ATTRIBUTE = "version"
+
+
+class VersionConflictError(Exception):
+    """Raised when a conditional write finds a different item version than expected."""
+
+    def __init__(self, expected_version: Optional[int], current_version: Optional[int]):
+        self.expected_version = expected_version
+        self.current_version = current_version
+        super().__init__(
+            f"Expected version {expected_version}, found {current_version}")
+
+
+def build_update_kwargs(
+    updates: Mapping[str, Any],
+    key_fields: Iterable[str],
+    expected_version: Optional[int] = None,
+    require_exists: bool = False,
+) -> Dict[str, Any]:
+    """
+    Build UpdateItem arguments that SET the given attributes, REMOVE those
+    whose value is None, and bump the item version. Key attributes and any
+    client-supplied version are ignored.
+    """
+    key_fields = list(key_fields)
+    keys = set(key_fields)
+    names: Dict[str, str] = {"#ver": VERSION_ATTRIBUTE}
+    values: Dict[str, Any] = {":zero": 0, ":one": 1}
+    set_parts = []
+    remove_parts = []
+    for index, (attr, value) in enumerate(updates.items()):
+        if attr in keys or attr == VERSION_ATTRIBUTE:
+            continue
+        name = f"#a{index}"
+        names[name] = attr
+        if value is None:
+            remove_parts.append(name)
+        else:
+            values[f":v{index}"] = value
+            set_parts.append(f"{name} = :v{index}")
+    set_parts.append("#ver = if_not_exists(#ver, :zero) + :one")
+    expression = "SET " + ", ".join(set_parts)
+    if remove_parts:
+        expression += " REMOVE " + ", ".join(remove_parts)
+
+    conditions = []
+    if require_exists:
+        names["#pk"] = key_fields[0]
+        conditions.append("attribute_exists(#pk)")
+    if expected_version is not None:
+        values[":expected"] = expected_version
+        if expected_version == 0:
+            conditions.append("(attribute_not_exists(#ver) OR #ver = :expected)")
+        else:
+            conditions.append("#ver = :expected")
+
+    kwargs: Dict[str, Any] = {
+        "UpdateExpression": expression,
+        "ExpressionAttributeNames": names,
+        "ExpressionAttributeValues": values,
+    }
+    if conditions:
+        kwargs["ConditionExpression"] = " AND ".join(conditions)
+    return kwargs
+
+
+def update_item(
+    table: Any,
+    key: Dict[str, Any],
+    updates: Mapping[str, Any],
+    expected_version: Optional[int] = None,
+    require_exists: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    Apply a partial update with UpdateItem and return the updated item.
+    Returns None when require_exists is set and the item does not exist;
+    raises VersionConflictError when expected_version does not match.
+    """
+    kwargs = build_update_kwargs(
+        updates, key.keys(), expected_version, require_exists)
+    try:
+        resp = table.update_item(
+            Key=key,
+            ReturnValues="ALL_NEW",
+            ReturnValuesOnConditionCheckFailure="ALL_OLD",
+            **kwargs
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+            raise
+        current = e.response.get("Item")
+        if current is None and require_exists:
+            return None
+        current_version = _current_version(current)
+        raise VersionConflictError(expected_version, current_version) from e
+    return resp.get("Attributes")
+
+
+def update_items(
+    table: Any,
+    updates: Iterable[Tuple[Dict[str, Any], Mapping[str, Any]]],
+) -> List[Dict[str, Any]]:
+    """
+    Apply (key, updates) partial updates with one UpdateItem each, since
+    BatchWriteItem can only replace whole items. Keys that do not exist are
+    skipped rather than created; returns the updated items.
+    """
+    updated = []
+    for key, item_updates in updates:
+        item = update_item(table, key, item_updates, require_exists=True)
+        if item is not None:
+            updated.append(item)
+    return updated
+
+
+def _current_version(item: Optional[Mapping[str, Any]]) -> Optional[int]:
+    if not item or VERSION_ATTRIBUTE not in item:
+        return None
+    value = item[VERSION_ATTRIBUTE]
+    # ReturnValuesOnConditionCheckFailure items come back in wire format
+    if isinstance(value, dict) and "N" in value:
+        return int(value["N"])
+    if isinstance(value, (int, Decimal)):
+        return int(value)
+    return None
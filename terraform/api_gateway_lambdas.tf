@@ -25,8 +25,9 @@ locals {
       handler = null
       environment = {
         LOG_LEVEL            = "DEBUG"
-        JWT_ISSUER           = "https://${aws_api_gateway_domain_name.custom.domain_name}"
-        LAUNCHDARKLY_SDK_KEY = data.launchdarkly_environment.production.api_key
+        JWT_ISSUER              = "https://${aws_api_gateway_domain_name.custom.domain_name}"
+        LAUNCHDARKLY_SDK_KEY    = data.launchdarkly_environment.production.api_key
+        AUTHORIZER_POLICY_SCOPE = var.authorizer_result_ttl > 0 ? "stage" : "method"
       }
     }
     well_known = {
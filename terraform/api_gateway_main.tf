@@ -2,7 +2,7 @@ module "api" {
   source  = "cloudposse/api-gateway/aws"
   version = "0.9.0"
 
-  openapi_config       = yamldecode(templatefile("${path.module}/openapi.tftpl", merge({}, local.lambda_invoke_arn_map)))
+  openapi_config       = yamldecode(templatefile("${path.module}/openapi.tftpl", merge({ authorizer_result_ttl = var.authorizer_result_ttl }, local.lambda_invoke_arn_map)))
   stage_name           = var.stage_name
   xray_tracing_enabled = true
   endpoint_type        = "REGIONAL"
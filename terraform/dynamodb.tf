@@ -278,9 +278,9 @@ resource "aws_dynamodb_table" "ws_connections" {
     type = "S"
   }
 
-  global_secondary_index {
-    name            = "ConnectionIdIndex"
-    hash_key        = "connectionId"
-    projection_type = "ALL"
+  # Connections expire unless a ping refreshes them (see WS_CONNECTION_TTL)
+  ttl {
+    attribute_name = "expiresAt"
+    enabled        = true
   }
 }
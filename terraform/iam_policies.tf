@@ -121,7 +121,8 @@ resource "aws_iam_policy" "ws_lambda_dynamodb_policy" {
           "dynamodb:UpdateItem",
           "dynamodb:GetItem",
           "dynamodb:Query",
-          "dynamodb:Scan"
+          "dynamodb:Scan",
+          "dynamodb:BatchWriteItem"
         ]
         Resource = [
           aws_dynamodb_table.ws_connections.arn,
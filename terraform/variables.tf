@@ -20,6 +20,30 @@ variable "stage_name" {
   default     = "v1"
 }
 
+variable "authorizer_result_ttl" {
+  description = "Seconds API Gateway caches REST authorizer decisions per token. A non-zero value switches the authorizer to stage-wide policies."
+  type        = number
+  default     = 0
+}
+
+variable "ws_stream_batch_size" {
+  description = "Maximum DynamoDB Stream records per notify_ws_stream invocation."
+  type        = number
+  default     = 100
+}
+
+variable "ws_stream_batching_window" {
+  description = "Seconds to gather DynamoDB Stream records before invoking notify_ws_stream."
+  type        = number
+  default     = 1
+}
+
+variable "ws_stream_max_retries" {
+  description = "Retries of failed DynamoDB Stream records before notify_ws_stream skips them."
+  type        = number
+  default     = 5
+}
+
 variable "domain_name" {
   description = "The root domain name (e.g., example.com) for Route53 lookup."
   type        = string
@@ -40,51 +40,77 @@ resource "aws_apigatewayv2_route" "ws_default" {
   target    = "integrations/${aws_apigatewayv2_integration.ws_default.id}"
 }
 
-# Event source mappings for DynamoDB Streams to notify_ws_stream Lambda
+# Event source mappings for DynamoDB Streams to notify_ws_stream Lambda.
+# The handler reports failed records by sequence number, so a retry resumes
+# from the first failure instead of replaying the whole batch
 resource "aws_lambda_event_source_mapping" "notify_ws_stream_volunteers" {
   event_source_arn  = aws_dynamodb_table.volunteers.stream_arn
   function_name     = module.ws_lambda["notify_ws_stream"].function_name
   starting_position = "LATEST"
-  batch_size        = 10
   enabled           = true
+
+  batch_size                         = var.ws_stream_batch_size
+  maximum_batching_window_in_seconds = var.ws_stream_batching_window
+  maximum_retry_attempts             = var.ws_stream_max_retries
+  function_response_types            = ["ReportBatchItemFailures"]
 }
 
 resource "aws_lambda_event_source_mapping" "notify_ws_stream_periods" {
   event_source_arn  = aws_dynamodb_table.periods.stream_arn
   function_name     = module.ws_lambda["notify_ws_stream"].function_name
   starting_position = "LATEST"
-  batch_size        = 10
   enabled           = true
+
+  batch_size                         = var.ws_stream_batch_size
+  maximum_batching_window_in_seconds = var.ws_stream_batching_window
+  maximum_retry_attempts             = var.ws_stream_max_retries
+  function_response_types            = ["ReportBatchItemFailures"]
 }
 
 resource "aws_lambda_event_source_mapping" "notify_ws_stream_units" {
   event_source_arn  = aws_dynamodb_table.units.stream_arn
   function_name     = module.ws_lambda["notify_ws_stream"].function_name
   starting_position = "LATEST"
-  batch_size        = 10
   enabled           = true
+
+  batch_size                         = var.ws_stream_batch_size
+  maximum_batching_window_in_seconds = var.ws_stream_batching_window
+  maximum_retry_attempts             = var.ws_stream_max_retries
+  function_response_types            = ["ReportBatchItemFailures"]
 }
 
 resource "aws_lambda_event_source_mapping" "notify_ws_stream_incidents" {
   event_source_arn  = aws_dynamodb_table.incidents.stream_arn
   function_name     = module.ws_lambda["notify_ws_stream"].function_name
   starting_position = "LATEST"
-  batch_size        = 10
   enabled           = true
+
+  batch_size                         = var.ws_stream_batch_size
+  maximum_batching_window_in_seconds = var.ws_stream_batching_window
+  maximum_retry_attempts             = var.ws_stream_max_retries
+  function_response_types            = ["ReportBatchItemFailures"]
 }
 
 resource "aws_lambda_event_source_mapping" "notify_ws_stream_locations" {
   event_source_arn  = aws_dynamodb_table.locations.stream_arn
   function_name     = module.ws_lambda["notify_ws_stream"].function_name
   starting_position = "LATEST"
-  batch_size        = 10
   enabled           = true
+
+  batch_size                         = var.ws_stream_batch_size
+  maximum_batching_window_in_seconds = var.ws_stream_batching_window
+  maximum_retry_attempts             = var.ws_stream_max_retries
+  function_response_types            = ["ReportBatchItemFailures"]
 }
 
 resource "aws_lambda_event_source_mapping" "notify_ws_stream_radios" {
   event_source_arn  = aws_dynamodb_table.radios.stream_arn
   function_name     = module.ws_lambda["notify_ws_stream"].function_name
   starting_position = "LATEST"
-  batch_size        = 10
   enabled           = true
+
+  batch_size                         = var.ws_stream_batch_size
+  maximum_batching_window_in_seconds = var.ws_stream_batching_window
+  maximum_retry_attempts             = var.ws_stream_max_retries
+  function_response_types            = ["ReportBatchItemFailures"]
 }
@@ -0,0 +1,21 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+LAMBDA_DIR = Path(__file__).resolve().parent.parent / "lambda"
+
+
+@pytest.fixture
+def load_lambda(monkeypatch):
+    """Import lambda/<name>/<module>.py afresh, with `env` set beforehand."""
+    def load(name: str, module: str = "handler", **env: str):
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+        monkeypatch.syspath_prepend(str(LAMBDA_DIR / name))
+        spec = importlib.util.spec_from_file_location(
+            f"lambda_{name}_{module}", LAMBDA_DIR / name / f"{module}.py")
+        loaded = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(loaded)
+        return loaded
+    return load
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+from authlib.jose import JsonWebKey, JsonWebToken
+
+ISSUER = "https://issuer.example"
+
+
+class StaticJWKS:
+    def __init__(self, key) -> None:
+        self.key = key
+
+    def load_key(self, header, payload):
+        return self.key
+
+
+@pytest.fixture
+def authorizer(load_lambda, monkeypatch):
+    module = load_lambda("authorizer", JWT_ISSUER=ISSUER)
+    key = JsonWebKey.generate_key("RSA", 2048, is_private=True)
+    monkeypatch.setattr(module, "get_jwks_cache", lambda url: StaticJWKS(key))
+    ttls = []
+    original_set = module._VERIFIED_TOKENS.set
+
+    def recording_set(cache_key, value, ttl=None):
+        ttls.append(ttl)
+        original_set(cache_key, value, ttl=ttl)
+
+    monkeypatch.setattr(module._VERIFIED_TOKENS, "set", recording_set)
+    module.key, module.ttls = key, ttls
+    return module
+
+
+def _token(key, exp: int) -> str:
+    payload = {"iss": ISSUER, "sub": "u1", "exp": exp}
+    return JsonWebToken(["RS256"]).encode({"alg": "RS256"}, payload, key).decode()
+
+
+def test_verified_tokens_are_cached_until_exp_minus_leeway(authorizer) -> None:
+    now = int(time.time())
+    token = _token(authorizer.key, now + 600)
+    assert authorizer.verify_jwt_token(token)["sub"] == "u1"
+    assert authorizer.verify_jwt_token(token)["sub"] == "u1"
+    assert authorizer.TOKEN_CACHE_STATS == {"hits": 1, "misses": 1}
+    [ttl] = authorizer.ttls
+    assert 600 - authorizer.TOKEN_LEEWAY - 2 <= ttl <= 600 - authorizer.TOKEN_LEEWAY
+
+
+def test_tokens_expiring_within_leeway_are_not_cached(authorizer) -> None:
+    token = _token(authorizer.key, int(time.time()) + 1)
+    assert authorizer.verify_jwt_token(token) is not None
+    assert authorizer.verify_jwt_token(token) is not None
+    assert authorizer.TOKEN_CACHE_STATS == {"hits": 0, "misses": 2}
+    assert authorizer.ttls == []
+
+
+def test_invalid_tokens_are_not_cached(authorizer) -> None:
+    other = JsonWebKey.generate_key("RSA", 2048, is_private=True)
+    token = _token(other, int(time.time()) + 600)
+    assert authorizer.verify_jwt_token(token) is None
+    assert authorizer.verify_jwt_token(token) is None
+    assert authorizer.TOKEN_CACHE_STATS["misses"] == 2
@@ -0,0 +1,86 @@
+import pytest
+
+from EventCoord.utils import batch
+from EventCoord.utils.batch import BatchIncompleteError, batch_get, batch_write, chunked
+
+
+class FakeClient:
+    def __init__(self, unprocessed_rounds=0):
+        self.unprocessed_rounds = unprocessed_rounds
+        self.write_calls = []
+        self.get_calls = []
+
+    def batch_write_item(self, RequestItems):
+        self.write_calls.append(RequestItems)
+        if self.unprocessed_rounds:
+            self.unprocessed_rounds -= 1
+            return {"UnprocessedItems": RequestItems}
+        return {"UnprocessedItems": {}}
+
+    def batch_get_item(self, RequestItems):
+        self.get_calls.append(RequestItems)
+        keys = RequestItems["things"]["Keys"]
+        if self.unprocessed_rounds:
+            self.unprocessed_rounds -= 1
+            return {"Responses": {"things": []}, "UnprocessedKeys": RequestItems}
+        return {"Responses": {"things": [dict(key) for key in keys]}}
+
+
+class FakeMeta:
+    def __init__(self, client):
+        self.client = client
+
+
+class FakeTable:
+    name = "things"
+
+    def __init__(self, client):
+        self.meta = FakeMeta(client)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(batch, "_backoff", lambda attempt: None)
+
+
+def test_chunked_splits_evenly() -> None:
+    assert [len(c) for c in chunked(range(60), 25)] == [25, 25, 10]
+
+
+def test_batch_write_chunks_at_25() -> None:
+    client = FakeClient()
+    written = batch_write(
+        FakeTable(client),
+        puts=[{"id": str(i)} for i in range(30)],
+        delete_keys=[{"id": "x"}],
+    )
+    assert written == 31
+    assert [len(call["things"]) for call in client.write_calls] == [25, 6]
+    assert client.write_calls[1]["things"][-1] == {"DeleteRequest": {"Key": {"id": "x"}}}
+
+
+def test_batch_write_retries_unprocessed_items() -> None:
+    client = FakeClient(unprocessed_rounds=2)
+    batch_write(FakeTable(client), puts=[{"id": "1"}])
+    assert len(client.write_calls) == 3
+
+
+def test_batch_write_gives_up_after_max_attempts() -> None:
+    client = FakeClient(unprocessed_rounds=100)
+    with pytest.raises(BatchIncompleteError):
+        batch_write(FakeTable(client), puts=[{"id": "1"}])
+
+
+def test_batch_get_chunks_at_100_and_dedupes() -> None:
+    client = FakeClient()
+    keys = [{"id": str(i)} for i in range(150)] + [{"id": "0"}]
+    items = batch_get(FakeTable(client), keys)
+    assert len(items) == 150
+    assert [len(call["things"]["Keys"]) for call in client.get_calls] == [100, 50]
+
+
+def test_batch_get_retries_unprocessed_keys() -> None:
+    client = FakeClient(unprocessed_rounds=1)
+    items = batch_get(FakeTable(client), [{"id": "1"}])
+    assert items == [{"id": "1"}]
+    assert len(client.get_calls) == 2
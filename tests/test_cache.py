@@ -0,0 +1,40 @@
+from EventCoord.utils import cache as cache_module
+from EventCoord.utils.cache import TTLCache
+
+
+def test_get_returns_default_for_missing_key() -> None:
+    cache: TTLCache[str] = TTLCache(maxsize=2, ttl=60)
+    assert cache.get("missing") is None
+    assert cache.get("missing", "fallback") == "fallback"
+
+
+def test_entries_expire_after_ttl(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache: TTLCache[str] = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", "1")
+    now[0] += 9
+    assert cache.get("a") == "1"
+    now[0] += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache: TTLCache[int] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_invalidate_where_drops_matching_entries() -> None:
+    cache: TTLCache[dict] = TTLCache(maxsize=10, ttl=60)
+    cache.set("aud-1", {"org_id": "o1"})
+    cache.set("aud-2", {"org_id": "o2"})
+    cache.invalidate_where(lambda _, org: org["org_id"] == "o1")
+    assert cache.get("aud-1") is None
+    assert cache.get("aud-2") == {"org_id": "o2"}
@@ -0,0 +1,29 @@
+from EventCoord.utils.connections import (
+    CONNECTION_TTL, connection_item, connection_key, is_expired, needs_touch, touch_values)
+
+
+def test_connection_item_sets_last_seen_and_expiry() -> None:
+    item = connection_item("c1", "o1", "u1", now=1000)
+    assert item == {
+        "connectionId": "c1", "orgId": "o1", "user": "u1",
+        "lastSeen": 1000, "expiresAt": 1000 + CONNECTION_TTL,
+    }
+    assert touch_values(now=2000) == {":seen": 2000, ":expires": 2000 + CONNECTION_TTL}
+
+
+def test_is_expired_skips_items_past_their_ttl() -> None:
+    assert is_expired({"expiresAt": 100}, now=100)
+    assert not is_expired({"expiresAt": 101}, now=100)
+    assert not is_expired({"connectionId": "legacy"}, now=100)
+
+
+def test_connection_key_uses_authorizer_org_id() -> None:
+    event = {"requestContext": {"connectionId": "c1", "authorizer": {"org_id": "o1"}}}
+    assert connection_key(event) == {"orgId": "o1", "connectionId": "c1"}
+    assert connection_key({"requestContext": {"connectionId": "c1"}}) is None
+
+
+def test_needs_touch_once_half_the_ttl_is_used() -> None:
+    assert needs_touch({"connectionId": "legacy"}, now=100)
+    assert not needs_touch({"expiresAt": 100 + CONNECTION_TTL}, now=100)
+    assert needs_touch({"expiresAt": 100 + CONNECTION_TTL // 2 - 1}, now=100)
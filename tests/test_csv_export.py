@@ -0,0 +1,51 @@
+from decimal import Decimal
+
+from EventCoord.utils.csv_export import discover_fieldnames, export_csv, iter_csv, normalize_csv_value
+
+
+ITEMS = [
+    {"org_id": "o", "unitId": "u1", "name": "Alpha", "type": "ALS"},
+    {"org_id": "o", "unitId": "u2", "name": "Bravo", "extra": "x"},
+]
+
+
+def test_normalize_csv_value_handles_decimal_in_maps() -> None:
+    assert normalize_csv_value({"n": Decimal("1")}) == '{"n":"1"}'
+    assert normalize_csv_value(None) == ""
+
+
+def test_iter_csv_yields_one_chunk_per_row() -> None:
+    chunks = list(iter_csv(ITEMS, ["name", "type"]))
+    assert chunks == ["name,type\r\n", "Alpha,ALS\r\n", "Bravo,\r\n"]
+
+
+def test_export_csv_with_schema_reads_source_once() -> None:
+    calls = []
+
+    def source():
+        calls.append(1)
+        return iter(ITEMS)
+
+    body = "".join(export_csv(source, {"org_id", "unitId"}, ["unitId", "name", "type"]))
+    assert body == "name,type\r\nAlpha,ALS\r\nBravo,\r\n"
+    assert len(calls) == 1
+
+
+def test_export_csv_without_schema_exports_every_column() -> None:
+    calls = []
+
+    def source():
+        calls.append(1)
+        return iter(ITEMS)
+
+    body = "".join(export_csv(source, {"org_id", "unitId"}, preferred=["type", "name"]))
+    assert body == "type,name,extra\r\nALS,Alpha,\r\n,Bravo,x\r\n"
+    assert len(calls) == 2
+
+
+def test_discover_fieldnames_puts_preferred_columns_first() -> None:
+    assert discover_fieldnames(ITEMS, {"org_id"}, ["name", "missing"]) == ["name", "extra", "type", "unitId"]
+
+
+def test_export_csv_without_schema_or_items_is_empty() -> None:
+    assert "".join(export_csv(lambda: iter([]), set())) == ""
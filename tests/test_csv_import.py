@@ -0,0 +1,89 @@
+from decimal import Decimal
+
+from EventCoord.utils.csv_import import apply_updates, diff_fields, parse_csv_rows, plan_import
+from EventCoord.utils.update_expression import VersionConflictError
+
+
+def _plan(rows, existing, **kwargs):
+    return plan_import(
+        rows,
+        existing,
+        key_fields=['email'],
+        id_field='volunteerId',
+        missing_key_error='Missing email',
+        **kwargs,
+    )
+
+
+def test_diff_fields_compares_in_csv_form() -> None:
+    existing = {'name': 'Ann', 'age': Decimal('42'), 'tags': ['a', 'b']}
+    assert diff_fields(existing, {'name': 'Ann', 'age': '42', 'tags': '["a","b"]'}) == {}
+    assert diff_fields(existing, {'name': 'Anne'}) == {'name': 'Anne'}
+
+
+def test_plan_import_skips_unchanged_rows() -> None:
+    existing = [{'org_id': 'o', 'volunteerId': 'v1', 'email': 'a@x.org', 'name': 'Ann', 'version': Decimal('3')}]
+    rows = parse_csv_rows('email,name,version\na@x.org,Ann,9\n')
+    plan = _plan(rows, existing)
+    assert plan.creates == []
+    assert plan.updates == {}
+    assert plan.summary()['unchanged'] == 1
+
+
+def test_plan_import_writes_only_changed_rows() -> None:
+    existing = [
+        {'volunteerId': 'v1', 'email': 'a@x.org', 'name': 'Ann', 'status': 'checked_in'},
+        {'volunteerId': 'v2', 'email': 'b@x.org', 'name': 'Bob'},
+    ]
+    rows = parse_csv_rows('email,name,status\na@x.org,Ann,\nb@x.org,Robert,\nc@x.org,Cy,\n,Nobody,\n')
+    plan = _plan(rows, existing)
+    assert plan.updates == {'v2': {'name': 'Robert'}}
+    assert plan.versions == {'v2': 0}
+    assert [row['email'] for row in plan.creates] == ['c@x.org']
+    assert plan.summary() == {
+        'created': 1,
+        'updated': 1,
+        'unchanged': 1,
+        'skipped': 1,
+        'conflicts': 0,
+        'errors': [{'row': 5, 'error': 'Missing email'}],
+    }
+
+
+def test_plan_import_merges_repeated_rows() -> None:
+    rows = parse_csv_rows('email,name\nc@x.org,Cy\nc@x.org,Cyrus\nc@x.org,Cyrus\n')
+    plan = _plan(rows, [])
+    assert len(plan.creates) == 1
+    assert plan.creates[0]['name'] == 'Cyrus'
+    assert (plan.created, plan.updated, plan.unchanged) == (1, 1, 1)
+
+
+def test_plan_import_validates_creates() -> None:
+    rows = parse_csv_rows('email\nc@x.org\n')
+    plan = _plan(rows, [], validate_create=lambda row: 'Missing incidentId')
+    assert plan.creates == []
+    assert plan.errors == [{'row': 2, 'error': 'Missing incidentId'}]
+
+
+def test_apply_updates_writes_changes_at_the_stored_version() -> None:
+    existing = [
+        {'volunteerId': 'v1', 'email': 'a@x.org', 'name': 'Ann', 'status': 'in', 'version': Decimal('7')},
+        {'volunteerId': 'v2', 'email': 'b@x.org', 'name': 'Bob', 'version': Decimal('2')},
+    ]
+    rows = parse_csv_rows('email,name\na@x.org,Anne\nb@x.org,Robert\nb@x.org,Rob\n')
+    plan = _plan(rows, existing)
+    writes = []
+
+    def update(item_id, changes, version):
+        writes.append((item_id, changes, version))
+        if item_id == 'v2':
+            raise VersionConflictError(version, 3)
+
+    apply_updates(plan, update)
+    assert writes == [('v1', {'name': 'Anne'}, 7), ('v2', {'name': 'Rob'}, 2)]
+    summary = plan.summary()
+    assert (summary['updated'], summary['conflicts']) == (1, 2)
+    assert summary['errors'] == [
+        {'row': 3, 'error': 'Item changed during import'},
+        {'row': 4, 'error': 'Item changed during import'},
+    ]
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from EventCoord.launchdarkly import flags as flags_module
+from EventCoord.launchdarkly.flags import AuthorizerFlags, Flags, get_flags
+
+USER = {"sub": "user-1", "email": "a@x.org", "org_id": "org-1", "org_name": "Org"}
+
+
+@pytest.fixture
+def flag_file(tmp_path, monkeypatch):
+    def install(name: str, content: str) -> None:
+        path = tmp_path / name
+        path.write_text(content)
+        monkeypatch.setenv("LAUNCHDARKLY_FLAG_FILE", str(path))
+        monkeypatch.setattr(flags_module, "_ld_client", None)
+
+    yield install
+    if flags_module._ld_client is not None:
+        flags_module._ld_client.close()
+
+
+def test_flags_are_read_from_json_file(flag_file) -> None:
+    flag_file("flags.json", json.dumps(
+        {"flagValues": {"admin-access": True, "super-admin-access": False}}))
+    flags = Flags(USER)
+    assert flags.has_admin_access() is True
+    assert flags.has_super_admin_access() is False
+    assert flags.entitlements() == {"admin_access": "true", "super_admin_access": "false"}
+
+
+def test_flags_are_read_from_yaml_file(flag_file) -> None:
+    flag_file("flags.yaml", "flagValues:\n  super-admin-access: true\n")
+    assert Flags(USER).has_super_admin_access() is True
+
+
+def test_client_is_created_once(flag_file) -> None:
+    flag_file("flags.json", json.dumps({"flagValues": {}}))
+    assert flags_module.get_ld_client() is flags_module.get_ld_client()
+
+
+def test_get_flags_prefers_authorizer_context() -> None:
+    event = {"requestContext": {"authorizer": {
+        "admin_access": "true", "super_admin_access": "false"}}}
+    flags = get_flags(event, USER)
+    assert isinstance(flags, AuthorizerFlags)
+    assert flags.has_admin_access() is True
+    assert flags.has_super_admin_access() is False
+
+
+def test_get_flags_falls_back_without_entitlements() -> None:
+    event = {"requestContext": {"authorizer": {"org_id": "org-1"}}}
+    assert isinstance(get_flags(event, USER), Flags)
@@ -19,3 +19,20 @@ def test_cors_headers_has_standard_keys() -> None:
     assert "Access-Control-Allow-Origin" in CORS_HEADERS
     assert "Access-Control-Allow-Headers" in CORS_HEADERS
     assert "Access-Control-Allow-Methods" in CORS_HEADERS
+
+
+def test_get_claims_prefers_authorizer_context() -> None:
+    token = jwt.encode({"sub": "from-token", "org_id": "org-token"}, "secret", algorithm="HS256")
+    event = {
+        "headers": {"Authorization": f"Bearer {token}"},
+        "requestContext": {"authorizer": {
+            "principalId": "user-123", "sub": "user-123", "org_id": "org-1",
+            "hd": None, "admin_access": "true"}},
+    }
+    assert get_claims(event) == {"sub": "user-123", "org_id": "org-1"}
+
+
+def test_get_claims_is_memoized_per_event() -> None:
+    event = {"requestContext": {"authorizer": {"sub": "user-123", "org_id": "org-1"}}}
+    assert get_claims(event) is get_claims(event)
+    assert get_claims({}) == {}
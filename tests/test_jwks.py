@@ -0,0 +1,103 @@
+import time
+from typing import Any, Dict, List
+
+from authlib.jose import JsonWebKey, JsonWebToken
+
+from EventCoord.client import jwks as jwks_module
+from EventCoord.client.jwks import JWKSCache
+
+
+class FakeResponse:
+    def __init__(self, keys: List[Dict[str, Any]], cache_control: str = "") -> None:
+        self._keys = keys
+        self.headers = {"Cache-Control": cache_control} if cache_control else {}
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> Dict[str, Any]:
+        return {"keys": self._keys}
+
+
+def _make_key(kid: str):
+    return JsonWebKey.generate_key("RSA", 2048, options={"kid": kid}, is_private=True)
+
+
+def _install(monkeypatch, responses: List[FakeResponse]) -> List[str]:
+    calls: List[str] = []
+
+    def fake_get(url: str, timeout: float) -> FakeResponse:
+        calls.append(url)
+        return responses[min(len(calls), len(responses)) - 1]
+
+    monkeypatch.setattr(jwks_module.requests, "get", fake_get)
+    return calls
+
+
+def test_keys_are_fetched_once_and_indexed_by_kid(monkeypatch) -> None:
+    key = _make_key("k1")
+    calls = _install(monkeypatch, [FakeResponse([key.as_dict(is_private=False)])])
+    cache = JWKSCache("https://example.test/jwks")
+    token = JsonWebToken(["RS256"]).encode({"alg": "RS256", "kid": "k1"}, {"sub": "u"}, key)
+    for _ in range(3):
+        claims = JsonWebToken(["RS256"]).decode(token, cache.load_key)
+        assert claims["sub"] == "u"
+    assert len(calls) == 1
+
+
+def test_ttl_follows_cache_control_max_age(monkeypatch) -> None:
+    key = _make_key("k1")
+    _install(monkeypatch, [FakeResponse([key.as_dict(is_private=False)], "public, max-age=120")])
+    now = [1000.0]
+    monkeypatch.setattr(jwks_module.time, "monotonic", lambda: now[0])
+    cache = JWKSCache("https://example.test/jwks", min_ttl=60, max_ttl=3600)
+    cache.refresh()
+    assert cache._expires_at == 1120.0
+
+
+def test_unknown_kid_triggers_refetch(monkeypatch) -> None:
+    old, new = _make_key("old"), _make_key("new")
+    calls = _install(monkeypatch, [
+        FakeResponse([old.as_dict(is_private=False)]),
+        FakeResponse([old.as_dict(is_private=False), new.as_dict(is_private=False)]),
+    ])
+    now = [1000.0]
+    monkeypatch.setattr(jwks_module.time, "monotonic", lambda: now[0])
+    cache = JWKSCache("https://example.test/jwks", unknown_kid_cooldown=30)
+    cache.get_key("old")
+    now[0] += 31
+    assert cache.get_key("new") is not None
+    assert len(calls) == 2
+
+
+def test_unknown_kid_refetch_is_rate_limited(monkeypatch) -> None:
+    key = _make_key("k1")
+    calls = _install(monkeypatch, [FakeResponse([key.as_dict(is_private=False)])])
+    cache = JWKSCache("https://example.test/jwks", unknown_kid_cooldown=30)
+    cache.get_key("k1")
+    try:
+        cache.get_key("forged")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+    assert len(calls) == 1
+
+
+def test_stale_keys_are_served_while_refreshing(monkeypatch) -> None:
+    key = _make_key("k1")
+    calls = _install(monkeypatch, [FakeResponse([key.as_dict(is_private=False)], "max-age=60")])
+    cache = JWKSCache("https://example.test/jwks")
+    cache.refresh()
+    cache._expires_at = 0.0
+    assert cache.get_key("k1") is not None
+    deadline = time.time() + 2
+    while len(calls) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(calls) == 2
+
+
+def test_caches_are_shared_per_url() -> None:
+    a = jwks_module.get_jwks_cache("https://shared.test/jwks")
+    assert jwks_module.get_jwks_cache("https://shared.test/jwks") is a
+    assert jwks_module.get_jwks_cache("https://other.test/jwks") is not a
@@ -0,0 +1,69 @@
+import pytest
+from authlib.jose import JsonWebKey
+
+
+class FakeSecrets:
+    def __init__(self) -> None:
+        self.versions = {}
+        self.current = None
+        self.calls = []
+        self.describe_error = None
+
+    def rotate(self, version_id: str) -> None:
+        key = JsonWebKey.generate_key("RSA", 2048, is_private=True)
+        self.versions[version_id] = key.as_pem(is_private=True).decode()
+        self.current = version_id
+
+    def describe_secret(self, SecretId):
+        self.calls.append("describe")
+        if self.describe_error:
+            raise self.describe_error
+        return {"VersionIdsToStages": {
+            version_id: ["AWSCURRENT"] if version_id == self.current else ["AWSPREVIOUS"]
+            for version_id in self.versions}}
+
+    def get_secret_value(self, SecretId):
+        self.calls.append("get")
+        return {"SecretString": self.versions[self.current], "VersionId": self.current}
+
+
+@pytest.fixture
+def login(load_lambda, monkeypatch):
+    module = load_lambda("login", JWT_PRIVATE_KEY_SECRET_ARN="arn:secret")
+    module.secrets = FakeSecrets()
+    module.secrets.rotate("v1")
+    module.now = [1000.0]
+    monkeypatch.setattr(module, "_get_secrets_client", lambda: module.secrets)
+    monkeypatch.setattr(module.time, "monotonic", lambda: module.now[0])
+    return module
+
+
+def test_signing_key_is_cached_and_reloaded_only_on_rotation(login) -> None:
+    key, kid = login.get_signing_key()
+    assert kid
+    # Within SIGNING_KEY_TTL: no Secrets Manager calls
+    assert login.get_signing_key() == (key, kid)
+    assert login.secrets.calls == ["get"]
+
+    # Expired, same version: only describe_secret
+    login.now[0] += login.SIGNING_KEY_TTL
+    assert login.get_signing_key() == (key, kid)
+    assert login.secrets.calls == ["get", "describe"]
+
+    # Expired, rotated: the new version is read
+    login.secrets.rotate("v2")
+    login.now[0] += login.SIGNING_KEY_TTL
+    new_key, new_kid = login.get_signing_key()
+    assert new_kid != kid
+    assert login.secrets.calls == ["get", "describe", "describe", "get"]
+
+
+def test_failed_rotation_check_keeps_the_cached_key(login) -> None:
+    key, kid = login.get_signing_key()
+    login.secrets.describe_error = RuntimeError("throttled")
+    login.now[0] += login.SIGNING_KEY_TTL
+    assert login.get_signing_key() == (key, kid)
+    # Served for another TTL without retrying the check
+    login.now[0] += 1
+    assert login.get_signing_key() == (key, kid)
+    assert login.secrets.calls == ["get", "describe"]
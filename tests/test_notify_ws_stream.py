@@ -0,0 +1,187 @@
+import json
+import threading
+
+import pytest
+from botocore.exceptions import ClientError
+
+VOLUNTEERS_ARN = "arn:aws:dynamodb:us-east-1:123:table/volunteers/stream/2026"
+
+
+class GoneException(Exception):
+    pass
+
+
+class FakeApiGateway:
+    class exceptions:
+        GoneException = GoneException
+
+    def __init__(self) -> None:
+        self.posts = []
+        self.gone = set()
+        self.errors = {}
+
+    def post_to_connection(self, ConnectionId, Data):
+        if ConnectionId in self.gone:
+            raise GoneException(ConnectionId)
+        if ConnectionId in self.errors:
+            code, status = self.errors[ConnectionId]
+            raise ClientError(
+                {"Error": {"Code": code, "Message": code},
+                 "ResponseMetadata": {"HTTPStatusCode": status}},
+                "PostToConnection")
+        self.posts.append((ConnectionId, json.loads(Data)))
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.deleted = []
+
+    def batch_write_item(self, RequestItems):
+        for requests in RequestItems.values():
+            self.deleted.extend(r["DeleteRequest"]["Key"] for r in requests)
+        return {}
+
+
+class FakeTable:
+    name = "WebSocketConnections"
+
+    def __init__(self, connections) -> None:
+        self.connections = connections
+        self.queries = 0
+        self.touched = []
+        self.meta = type("Meta", (), {"client": FakeClient()})()
+
+    def query(self, KeyConditionExpression):
+        self.queries += 1
+        return {"Items": list(self.connections)}
+
+    def update_item(self, Key, **kwargs):
+        self.touched.append((Key["connectionId"], threading.current_thread()))
+
+
+@pytest.fixture
+def notify(load_lambda, monkeypatch):
+    module = load_lambda("notify_ws_stream", WS_API_ENDPOINT="https://ws.example")
+    module.fake_table = FakeTable([
+        {"orgId": "o1", "connectionId": "c1"},
+        {"orgId": "o1", "connectionId": "c2"},
+    ])
+    module.fake_apigw = FakeApiGateway()
+    monkeypatch.setattr(module, "table", module.fake_table)
+    monkeypatch.setattr(module, "get_apigw", lambda: module.fake_apigw)
+    return module
+
+
+def _image(status="in", version="1", period="p1"):
+    return {
+        "org_id": {"S": "o1"}, "volunteerId": {"S": "v1"}, "periodId": {"S": period},
+        "status": {"S": status}, "version": {"N": version},
+    }
+
+
+def _record(seq, event_name="INSERT", new=None, old=None):
+    dynamodb = {"SequenceNumber": seq, "Keys": {"volunteerId": {"S": "v1"}}}
+    if new is not None:
+        dynamodb["NewImage"] = new
+    if old is not None:
+        dynamodb["OldImage"] = old
+    return {"eventName": event_name, "eventSourceARN": VOLUNTEERS_ARN, "dynamodb": dynamodb}
+
+
+def _invoke(module, *records):
+    return module.lambda_handler({"Records": list(records)}, None)
+
+
+def test_batch_is_coalesced_into_one_message_per_connection(notify) -> None:
+    result = _invoke(notify, _record("100", new=_image()), _record("200", new=_image("out")))
+    assert result == {"batchItemFailures": []}
+    message = {"action": "volunteersUpdated", "orgId": "o1", "periodId": "p1"}
+    assert sorted(notify.fake_apigw.posts, key=lambda p: p[0]) == [("c1", message), ("c2", message)]
+    assert notify.fake_table.queries == 1
+
+
+def test_no_op_modify_is_not_sent(notify) -> None:
+    record = _record("100", "MODIFY", new=_image(version="2"), old=_image(version="1"))
+    assert _invoke(notify, record) == {"batchItemFailures": []}
+    assert notify.fake_apigw.posts == []
+    assert notify.fake_table.queries == 0
+
+
+def test_gone_connections_are_deleted_in_one_batch(notify) -> None:
+    notify.fake_apigw.gone = {"c2"}
+    assert _invoke(notify, _record("100", new=_image())) == {"batchItemFailures": []}
+    assert [conn for conn, _ in notify.fake_apigw.posts] == ["c1"]
+    assert notify.fake_table.meta.client.deleted == [{"orgId": "o1", "connectionId": "c2"}]
+
+
+def test_subscriptions_and_expiry_filter_connections(notify) -> None:
+    notify.fake_table.connections = [
+        {"orgId": "o1", "connectionId": "c1", "subscriptions": [{"entity": "units"}]},
+        {"orgId": "o1", "connectionId": "c2", "expiresAt": 1},
+        {"orgId": "o1", "connectionId": "c3",
+         "subscriptions": [{"entity": "volunteers", "periodId": "p1"}]},
+    ]
+    _invoke(notify, _record("100", new=_image()))
+    assert [conn for conn, _ in notify.fake_apigw.posts] == ["c3"]
+
+
+def test_throttled_records_are_reported_and_not_resent_on_retry(notify) -> None:
+    notify.fake_apigw.errors = {"c2": ("LimitExceededException", 429)}
+    records = [_record("100", new=_image()), _record("200", new=_image("out"))]
+    assert _invoke(notify, *records) == {
+        "batchItemFailures": [{"itemIdentifier": "100"}, {"itemIdentifier": "200"}]}
+    assert [conn for conn, _ in notify.fake_apigw.posts] == ["c1"]
+
+    notify.fake_apigw.errors = {}
+    assert _invoke(notify, *records) == {"batchItemFailures": []}
+    # c1 already received this message for both records; only c2 is sent to
+    assert [conn for conn, _ in notify.fake_apigw.posts] == ["c1", "c2"]
+
+
+def test_new_records_in_a_retry_are_still_sent(notify) -> None:
+    _invoke(notify, _record("100", new=_image()))
+    _invoke(notify, _record("100", new=_image()), _record("300", new=_image("out")))
+    assert [conn for conn, _ in notify.fake_apigw.posts] == ["c1", "c2", "c1", "c2"]
+
+
+def test_permanent_post_errors_are_not_retried(notify) -> None:
+    notify.fake_apigw.errors = {"c2": ("PayloadTooLargeException", 413)}
+    assert _invoke(notify, _record("100", new=_image())) == {"batchItemFailures": []}
+
+
+def test_unroutable_records_are_dropped_not_retried(notify) -> None:
+    broken = _record("100", new={"volunteerId": {"S": "v1"}})
+    result = _invoke(notify, broken, _record("200", new=_image()))
+    assert result == {"batchItemFailures": []}
+    assert len(notify.fake_apigw.posts) == 2
+
+
+def test_connection_read_failures_report_the_org_records(notify, monkeypatch) -> None:
+    def fail(**kwargs):
+        raise ClientError({"Error": {"Code": "ProvisionedThroughputExceededException"}}, "Query")
+
+    monkeypatch.setattr(notify.fake_table, "query", fail)
+    result = _invoke(notify, _record("100", new=_image()), _record("200", new=_image("out")))
+    assert result == {"batchItemFailures": [{"itemIdentifier": "100"}, {"itemIdentifier": "200"}]}
+
+
+def test_delta_mode_sends_changes(notify, monkeypatch) -> None:
+    monkeypatch.setattr(notify, "MESSAGE_MODE", "delta")
+    record = _record("100", "MODIFY", new=_image("out", "2"), old=_image("in", "1"))
+    _invoke(notify, record)
+    _, delta = notify.fake_apigw.posts[0]
+    assert delta["event"] == "MODIFY"
+    assert delta["changes"] == {"status": "out", "version": 2}
+    assert delta["key"] == {"volunteerId": "v1"}
+
+
+def test_reached_connections_have_their_expiry_extended(notify) -> None:
+    notify.fake_table.connections = [
+        {"orgId": "o1", "connectionId": "c1"},
+        {"orgId": "o1", "connectionId": "c2"},
+        {"orgId": "o1", "connectionId": "fresh", "expiresAt": 2 ** 40},
+    ]
+    notify.fake_apigw.gone = {"c2"}
+    _invoke(notify, _record("100", new=_image()))
+    # The shared Table resource is only used from the handler's thread
+    assert notify.fake_table.touched == [("c1", threading.main_thread())]
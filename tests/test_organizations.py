@@ -0,0 +1,73 @@
+import pytest
+
+from EventCoord.models import organizations as org_module
+from EventCoord.models.organizations import AudienceIndex, Organization
+
+
+class FakeClient:
+    def __init__(self, auds) -> None:
+        self.auds = auds
+        self.scans = []
+
+    def scan(self, TableName, Segment, TotalSegments, **kwargs):
+        self.scans.append(Segment)
+        auds = [aud for i, aud in enumerate(self.auds) if i % TotalSegments == Segment]
+        return {"Items": [{"aud": {"S": aud}} for aud in auds]}
+
+
+class FakeTable:
+    name = "organizations"
+
+    def __init__(self, auds, gsi=()) -> None:
+        self.meta = type("Meta", (), {"client": FakeClient(auds)})()
+        self.gsi = set(gsi)
+        self.queries = []
+
+    def query(self, IndexName, KeyConditionExpression):
+        aud = KeyConditionExpression.get_expression()["values"][1]
+        self.queries.append(aud)
+        return {"Items": [{"org_id": f"org-{aud}", "aud": aud}] if aud in self.gsi else []}
+
+
+@pytest.fixture
+def fake_table(monkeypatch):
+    table = FakeTable(["a1", "a2", "a3"], gsi={"late"})
+    monkeypatch.setattr(org_module, "table", table)
+    monkeypatch.setattr(org_module, "_invalidation_hooks", [])
+    org_module._by_aud.clear()
+    yield table
+    org_module._by_aud.clear()
+
+
+def test_list_auds_scans_every_segment(fake_table) -> None:
+    assert sorted(Organization.list_auds(segments=2)) == ["a1", "a2", "a3"]
+    assert sorted(fake_table.meta.client.scans) == [0, 1]
+
+
+def test_audience_index_reloads_after_ttl(fake_table, monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(org_module.time, "monotonic", lambda: now[0])
+    index = AudienceIndex(ttl=60, segments=1)
+    assert "a1" in index
+    fake_table.meta.client.auds = ["a1", "new"]
+    assert "new" not in index.auds()
+    now[0] += 61
+    assert "new" in index.auds()
+    assert len(fake_table.meta.client.scans) == 2
+
+
+def test_unknown_audiences_fall_back_to_gsi_and_are_negatively_cached(fake_table) -> None:
+    index = AudienceIndex(segments=1)
+    assert "late" in index
+    assert "late" in index.auds()
+    assert "bogus" not in index
+    assert "bogus" not in index
+    assert fake_table.queries == ["late", "bogus"]
+
+
+def test_organization_writes_invalidate_the_index(fake_table) -> None:
+    index = AudienceIndex(segments=1)
+    index.auds()
+    fake_table.meta.client.auds = ["a1", "renamed"]
+    Organization.invalidate_cache("org-1")
+    assert "renamed" in index.auds()
@@ -0,0 +1,81 @@
+import pytest
+
+from EventCoord.utils.pagination import (
+    NEXT_TOKEN_HEADER,
+    decode_next_token,
+    encode_next_token,
+    get_page_params,
+    iter_items,
+    page_headers,
+    query_page,
+)
+
+
+class FakeQuery:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(dict(kwargs))
+        index = len(self.calls) - 1
+        resp = {"Items": self.pages[index]}
+        if index < len(self.pages) - 1:
+            resp["LastEvaluatedKey"] = {"org_id": "org-1", "id": str(index)}
+        return resp
+
+
+def test_iter_items_follows_last_evaluated_key() -> None:
+    query = FakeQuery([[{"id": "a"}], [{"id": "b"}], [{"id": "c"}]])
+    items = list(iter_items(query, KeyConditionExpression="k"))
+    assert [item["id"] for item in items] == ["a", "b", "c"]
+    assert "ExclusiveStartKey" not in query.calls[0]
+    assert query.calls[2]["ExclusiveStartKey"] == {"org_id": "org-1", "id": "1"}
+
+
+def test_iter_items_is_lazy() -> None:
+    query = FakeQuery([[{"id": "a"}], [{"id": "b"}]])
+    items = iter_items(query)
+    assert next(items) == {"id": "a"}
+    assert len(query.calls) == 1
+
+
+def test_query_page_returns_resume_key() -> None:
+    query = FakeQuery([[{"id": "a"}], [{"id": "b"}]])
+    items, last_key = query_page(query, 1, None)
+    assert items == [{"id": "a"}]
+    assert last_key == {"org_id": "org-1", "id": "0"}
+    assert query.calls[0]["Limit"] == 1
+
+
+def test_next_token_round_trip() -> None:
+    key = {"org_id": "org-1", "volunteerId": "v-1"}
+    assert decode_next_token(encode_next_token(key)) == key
+    assert encode_next_token(None) is None
+
+
+def test_get_page_params_defaults_to_unpaginated() -> None:
+    assert get_page_params({}) == (None, None)
+    assert get_page_params({"queryStringParameters": None}) == (None, None)
+
+
+def test_get_page_params_rejects_bad_input() -> None:
+    with pytest.raises(ValueError):
+        get_page_params({"queryStringParameters": {"limit": "zero"}})
+    with pytest.raises(ValueError):
+        get_page_params({"queryStringParameters": {"limit": "0"}})
+    with pytest.raises(ValueError):
+        get_page_params({"queryStringParameters": {"nextToken": "!!"}})
+
+
+def test_get_page_params_rejects_foreign_org_token() -> None:
+    token = encode_next_token({"org_id": "org-2", "volunteerId": "v-1"})
+    with pytest.raises(ValueError):
+        get_page_params({"queryStringParameters": {"nextToken": token}}, "org-1")
+
+
+def test_page_headers_only_adds_token_when_more_items() -> None:
+    assert NEXT_TOKEN_HEADER not in page_headers({}, None)
+    headers = page_headers({"A": "b"}, {"org_id": "org-1"})
+    assert headers["A"] == "b"
+    assert headers[NEXT_TOKEN_HEADER]
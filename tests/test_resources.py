@@ -0,0 +1,66 @@
+from EventCoord.utils import resources
+from EventCoord.utils.resources import LazyTable, lazy_resource, reset_resources
+
+
+def test_lazy_resource_creates_once() -> None:
+    reset_resources()
+    calls = []
+
+    def factory() -> object:
+        calls.append(1)
+        return object()
+
+    first = lazy_resource("thing", factory)
+    assert lazy_resource("thing", factory) is first
+    assert len(calls) == 1
+    reset_resources()
+
+
+def test_lazy_table_defers_creation_until_used(monkeypatch) -> None:
+    reset_resources()
+    monkeypatch.setenv("UNITS_TABLE", "units-test")
+    created = []
+
+    class FakeTable:
+        def __init__(self, name: str) -> None:
+            created.append(name)
+            self.name = name
+
+    class FakeResource:
+        def Table(self, name: str) -> FakeTable:
+            return FakeTable(name)
+
+    monkeypatch.setattr(resources, "dynamodb_resource", lambda: FakeResource())
+    table = LazyTable("UNITS_TABLE", "units")
+    assert created == []
+    assert table.name == "units-test"
+    assert table.name == "units-test"
+    assert created == ["units-test"]
+    reset_resources()
+
+
+def test_model_modules_import_without_aws_configuration() -> None:
+    from EventCoord.models import units, volunteers  # noqa: F401
+
+
+def test_clients_are_memoized_per_service_endpoint_and_region() -> None:
+    reset_resources()
+    a = resources.get_client("secretsmanager", region_name="us-east-1")
+    assert resources.get_client("secretsmanager", region_name="us-east-1") is a
+    assert resources.get_client("secretsmanager", region_name="us-west-2") is not a
+    assert resources.get_client(
+        "secretsmanager", endpoint_url="http://localhost:4566", region_name="us-east-1") is not a
+    config = a.meta.config
+    assert config.tcp_keepalive is True
+    assert config.max_pool_connections == 50
+    assert config.retries["mode"] == "adaptive"
+    reset_resources()
+
+
+def test_client_config_overrides_accept_dict_values() -> None:
+    reset_resources()
+    retries = {"mode": "standard", "total_max_attempts": 1}
+    a = resources.get_client("secretsmanager", region_name="us-east-1", retries=retries)
+    assert resources.get_client("secretsmanager", region_name="us-east-1", retries=dict(retries)) is a
+    assert a.meta.config.retries == retries
+    reset_resources()
@@ -0,0 +1,44 @@
+import json
+from decimal import Decimal
+
+from EventCoord.utils.stream import StreamImage, encode_message, image_diff
+
+
+def test_image_diff_reports_changed_added_and_removed_attributes() -> None:
+    old = {"id": "1", "status": "in", "notes": "x", "version": Decimal(2)}
+    new = {"id": "1", "status": "out", "radio": "r1", "version": Decimal(3)}
+    changed, removed = image_diff(old, new)
+    assert changed == {"status": "out", "radio": "r1", "version": Decimal(3)}
+    assert removed == ["notes"]
+
+
+def test_image_diff_skips_ignored_attributes() -> None:
+    changed, removed = image_diff({"a": 1, "version": 1}, {"a": 1, "version": 2}, ignore=["version"])
+    assert changed == {}
+    assert removed == []
+
+
+def test_image_diff_handles_missing_images() -> None:
+    assert image_diff(None, {"a": 1}) == ({"a": 1}, [])
+    assert image_diff({"a": 1}, None) == ({}, ["a"])
+
+
+def test_encode_message_handles_stream_types() -> None:
+    payload = encode_message({"n": Decimal("2"), "f": Decimal("1.5"), "tags": {"b", "a"}})
+    assert json.loads(payload) == {"n": 2, "f": 1.5, "tags": ["a", "b"]}
+
+
+def test_stream_image_deserializes_attributes_on_access() -> None:
+    image = StreamImage({"org_id": {"S": "o1"}, "count": {"N": "3"}, "tags": {"SS": ["a"]}})
+    assert image["org_id"] == "o1"
+    assert image.get("missing") is None
+    assert set(image._values) == {"org_id"}
+    assert image.to_dict() == {"org_id": "o1", "count": Decimal(3), "tags": {"a"}}
+    assert not StreamImage(None)
+
+
+def test_image_diff_on_stream_images_skips_unchanged_attributes() -> None:
+    old = StreamImage({"id": {"S": "1"}, "log": {"L": [{"S": "x"}]}, "status": {"S": "in"}})
+    new = StreamImage({"id": {"S": "1"}, "log": {"L": [{"S": "x"}]}, "status": {"S": "out"}})
+    assert image_diff(old, new) == ({"status": "out"}, [])
+    assert "log" not in old._values and "log" not in new._values
@@ -0,0 +1,49 @@
+import pytest
+
+from EventCoord.utils.subscriptions import (
+    is_subscribed, merge_topics, normalize_topic, remove_topics)
+
+
+def test_normalize_topic_accepts_entity_names_and_scopes() -> None:
+    assert normalize_topic("units") == {"entity": "units"}
+    assert normalize_topic({"entity": "volunteers", "periodId": "p1"}) == {
+        "entity": "volunteers", "periodId": "p1"}
+
+
+@pytest.mark.parametrize("raw", [
+    {"entity": "secrets"},
+    {"entity": "units", "periodId": "p1"},
+    {"entity": "volunteers", "periodId": ""},
+    42,
+])
+def test_normalize_topic_rejects_invalid_topics(raw) -> None:
+    with pytest.raises(ValueError):
+        normalize_topic(raw)
+
+
+def test_merge_and_remove_topics_deduplicate() -> None:
+    topics = merge_topics([{"entity": "units"}], [{"entity": "units"}, {"entity": "radios"}])
+    assert topics == [{"entity": "units"}, {"entity": "radios"}]
+    assert remove_topics(topics, [{"entity": "units"}]) == [{"entity": "radios"}]
+
+
+def test_connections_that_never_subscribed_receive_everything() -> None:
+    assert is_subscribed(None, "units", {})
+    assert is_subscribed(None, "volunteers", {"periodId": "p1"})
+
+
+def test_unsubscribing_from_every_topic_receives_nothing() -> None:
+    subs = remove_topics([{"entity": "units"}], [{"entity": "units"}])
+    assert subs == []
+    assert not is_subscribed(subs, "units", {})
+    assert not is_subscribed(subs, "volunteers", {"periodId": "p1"})
+
+
+def test_scoped_subscriptions_filter_messages() -> None:
+    subs = [{"entity": "volunteers", "periodId": "p1"}, {"entity": "units"}]
+    assert is_subscribed(subs, "volunteers", {"periodId": "p1"})
+    assert not is_subscribed(subs, "volunteers", {"periodId": "p2"})
+    assert is_subscribed(subs, "units", {})
+    assert not is_subscribed(subs, "radios", {})
+    # Changes that do not carry the scoped attribute are still delivered
+    assert is_subscribed(subs, "volunteers", {"periodId": None})
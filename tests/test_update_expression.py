@@ -0,0 +1,91 @@
+from decimal import Decimal
+
+import pytest
+from botocore.exceptions import ClientError
+
+from EventCoord.utils.update_expression import (
+    VersionConflictError,
+    build_update_kwargs,
+    update_item,
+    update_items,
+)
+
+
+def test_build_update_kwargs_sets_and_removes_changed_attributes() -> None:
+    kwargs = build_update_kwargs(
+        {"org_id": "org-1", "volunteerId": "v-1", "status": "checked_in", "location": None},
+        ["org_id", "volunteerId"],
+    )
+    names = kwargs["ExpressionAttributeNames"]
+    assert "org_id" not in names.values()
+    assert "volunteerId" not in names.values()
+    assert kwargs["UpdateExpression"].startswith("SET ")
+    assert " REMOVE " in kwargs["UpdateExpression"]
+    assert "#ver = if_not_exists(#ver, :zero) + :one" in kwargs["UpdateExpression"]
+    assert "checked_in" in kwargs["ExpressionAttributeValues"].values()
+    assert "ConditionExpression" not in kwargs
+
+
+def test_build_update_kwargs_ignores_client_version() -> None:
+    kwargs = build_update_kwargs({"version": 7}, ["org_id"])
+    assert 7 not in kwargs["ExpressionAttributeValues"].values()
+
+
+def test_build_update_kwargs_conditions_on_expected_version() -> None:
+    kwargs = build_update_kwargs({"name": "x"}, ["org_id"], expected_version=3)
+    assert kwargs["ConditionExpression"] == "#ver = :expected"
+    assert kwargs["ExpressionAttributeValues"][":expected"] == 3
+    kwargs = build_update_kwargs({"name": "x"}, ["org_id"], expected_version=0)
+    assert "attribute_not_exists(#ver)" in kwargs["ConditionExpression"]
+
+
+def test_build_update_kwargs_require_exists() -> None:
+    kwargs = build_update_kwargs({"name": "x"}, ["org_id"], require_exists=True)
+    assert kwargs["ConditionExpression"] == "attribute_exists(#pk)"
+    assert kwargs["ExpressionAttributeNames"]["#pk"] == "org_id"
+
+
+class FailingTable:
+    def __init__(self, item):
+        self.item = item
+
+    def update_item(self, **kwargs):
+        response = {"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}
+        if self.item is not None:
+            response["Item"] = self.item
+        raise ClientError(response, "UpdateItem")
+
+
+def test_update_item_raises_version_conflict() -> None:
+    table = FailingTable({"org_id": {"S": "org-1"}, "version": {"N": "5"}})
+    with pytest.raises(VersionConflictError) as exc:
+        update_item(table, {"org_id": "org-1"}, {"name": "x"}, expected_version=4)
+    assert exc.value.current_version == 5
+
+
+def test_update_item_returns_none_for_missing_item() -> None:
+    table = FailingTable(None)
+    assert update_item(table, {"org_id": "org-1"}, {"name": "x"}, require_exists=True) is None
+
+
+class RecordingTable:
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.calls = []
+
+    def update_item(self, Key, **kwargs):
+        self.calls.append((Key, kwargs))
+        if Key["id"] in self.missing:
+            raise ClientError(
+                {"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}, "UpdateItem")
+        return {"Attributes": {**Key, "version": Decimal("8")}}
+
+
+def test_update_items_applies_partial_updates_to_existing_items() -> None:
+    table = RecordingTable(missing={"gone"})
+    updated = update_items(table, [({"id": "a"}, {"status": "x"}), ({"id": "gone"}, {"status": "y"})])
+    assert updated == [{"id": "a", "version": Decimal("8")}]
+    key, kwargs = table.calls[0]
+    # Only the given attribute is SET; the rest of the item is left alone
+    assert kwargs["UpdateExpression"] == "SET #a0 = :v0, #ver = if_not_exists(#ver, :zero) + :one"
+    assert kwargs["ConditionExpression"] == "attribute_exists(#pk)"
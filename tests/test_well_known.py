@@ -0,0 +1,59 @@
+import json
+
+import pytest
+from authlib.jose import JsonWebKey
+
+
+@pytest.fixture
+def well_known(load_lambda):
+    return load_lambda("well_known", "jwks", JWT_PUBLIC_KEY_SECRET_ARN="arn:secret")
+
+
+class FakeSecrets:
+    def __init__(self, pems) -> None:
+        self.pems = pems
+        self.calls = []
+
+    def list_secret_version_ids(self, SecretId):
+        self.calls.append("list")
+        return {"Versions": [
+            {"VersionId": version, "CreatedDate": index}
+            for index, version in enumerate(self.pems)]}
+
+    def get_secret_value(self, SecretId, VersionId):
+        self.calls.append(VersionId)
+        return {"SecretString": self.pems[VersionId]}
+
+
+@pytest.mark.parametrize("header, matches", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"old", W/"abc"', True),
+    ("*", True),
+    ('"old"', False),
+    ("", False),
+    (None, False),
+])
+def test_etag_matches(well_known, header, matches) -> None:
+    assert well_known._etag_matches(header, '"abc"') is matches
+
+
+def test_jwks_is_cached_and_revalidated_with_etag(well_known, monkeypatch) -> None:
+    pem = JsonWebKey.generate_key("RSA", 2048, is_private=True).as_pem(is_private=False).decode()
+    secrets = FakeSecrets({"v1": pem})
+    monkeypatch.setattr(well_known, "_get_secrets_client", lambda: secrets)
+
+    first = well_known.lambda_handler({}, None)
+    assert first["statusCode"] == 200
+    assert len(json.loads(first["body"])["keys"]) == 1
+    etag = first["headers"]["ETag"]
+    assert first["headers"]["Cache-Control"] == f"public, max-age={well_known.JWKS_CACHE_TTL}"
+
+    second = well_known.lambda_handler({"headers": {"If-None-Match": f"W/{etag}"}}, None)
+    assert second["statusCode"] == 304
+    assert second["headers"]["ETag"] == etag
+    # Served from the per-container cache within JWKS_CACHE_TTL
+    assert secrets.calls == ["list", "v1"]
+
+    stale = well_known.lambda_handler({"headers": {"if-none-match": '"other"'}}, None)
+    assert stale["statusCode"] == 200
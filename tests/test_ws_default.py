@@ -0,0 +1,90 @@
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+from EventCoord.utils.subscriptions import is_subscribed
+
+EVENT_CONTEXT = {"connectionId": "c1", "authorizer": {"org_id": "o1"}}
+
+
+def _conditional_check_failed():
+    return ClientError(
+        {"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}, "UpdateItem")
+
+
+class FakeTable:
+    def __init__(self, item) -> None:
+        self.item = item
+        # Called before each conditional write, to simulate a concurrent change
+        self.before_write = None
+
+    def get_item(self, Key):
+        return {"Item": dict(self.item)} if self.item is not None else {}
+
+    def update_item(self, Key, UpdateExpression, ConditionExpression, ExpressionAttributeValues):
+        if self.before_write:
+            self.before_write(self)
+        if self.item is None:
+            raise _conditional_check_failed()
+        if "attribute_not_exists(subscriptions)" in ConditionExpression and "subscriptions" in self.item:
+            raise _conditional_check_failed()
+        if ":old" in ExpressionAttributeValues and self.item.get("subscriptions") != ExpressionAttributeValues[":old"]:
+            raise _conditional_check_failed()
+        if ":s" in ExpressionAttributeValues:
+            self.item["subscriptions"] = ExpressionAttributeValues[":s"]
+        self.item["expiresAt"] = ExpressionAttributeValues[":expires"]
+
+
+@pytest.fixture
+def ws_default(load_lambda, monkeypatch):
+    module = load_lambda("ws_default")
+    module.fake_table = FakeTable({"orgId": "o1", "connectionId": "c1"})
+    monkeypatch.setattr(module, "table", module.fake_table)
+    return module
+
+
+def _send(module, message):
+    event = {"requestContext": EVENT_CONTEXT, "body": json.dumps(message)}
+    return json.loads(module.lambda_handler(event, None)["body"])
+
+
+def test_unsubscribing_the_last_topic_stops_all_messages(ws_default) -> None:
+    assert _send(ws_default, {"action": "subscribe", "topics": ["units"]})["subscriptions"] == [
+        {"entity": "units"}]
+    assert _send(ws_default, {"action": "unsubscribe", "topics": ["units"]})["subscriptions"] == []
+    stored = ws_default.fake_table.item["subscriptions"]
+    assert stored == []
+    assert not is_subscribed(stored, "units", {})
+
+
+def test_unsubscribing_before_subscribing_keeps_every_topic(ws_default) -> None:
+    reply = _send(ws_default, {"action": "unsubscribe", "topics": ["units"]})
+    assert reply == {"type": "unsubscribed", "subscriptions": None}
+    assert "subscriptions" not in ws_default.fake_table.item
+
+
+def test_concurrent_subscription_changes_are_not_lost(ws_default) -> None:
+    table = ws_default.fake_table
+    table.item["subscriptions"] = [{"entity": "units"}]
+
+    def concurrent_subscribe(t):
+        # Another message adds radios between this read and write, once
+        t.before_write = None
+        t.item["subscriptions"] = t.item["subscriptions"] + [{"entity": "radios"}]
+
+    table.before_write = concurrent_subscribe
+    reply = _send(ws_default, {"action": "subscribe", "topics": ["locations"]})
+    assert reply["subscriptions"] == [{"entity": "units"}, {"entity": "radios"}, {"entity": "locations"}]
+    assert table.item["subscriptions"] == reply["subscriptions"]
+
+
+def test_subscribing_on_a_removed_connection_returns_404(ws_default) -> None:
+    def disconnect(t):
+        t.item = None
+
+    ws_default.fake_table.before_write = disconnect
+    event = {"requestContext": EVENT_CONTEXT, "body": json.dumps({"action": "subscribe", "topics": ["units"]})}
+    response = ws_default.lambda_handler(event, None)
+    assert response["statusCode"] == 404
+    assert json.loads(response["body"])["error"] == "Connection not found"